@@ -0,0 +1,251 @@
+#########################################################################
+# Program description:                                                  #
+#   Saves files on a background thread so the IDE never waits for the   #
+#   disk. A file is only written when its content differs from what is  #
+#   on disk, and it is written to a temporary file that then replaces   #
+#   the original, so readers never see a half written file.             #
+#########################################################################
+
+import hashlib
+import os
+import queue
+import stat
+import threading
+
+
+"""
+Returns the digest used to compare the content of a file
+
+Parameters
+----------
+text : str
+    Content of the file
+
+Returns
+-------
+bytes
+    The digest of the content
+"""
+def digest(text: str) -> bytes:
+
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+"""
+Writes a text file atomically, replacing it only once the new content is on disk
+
+Parameters
+----------
+path : str
+    Path of the file
+text : str
+    New content of the file
+"""
+def write_atomic(path: str, text: str) -> None:
+
+    # replace the target of a symlink, not the link itself
+    path = os.path.realpath(path)
+    temp_path = path + ".tmp"
+    try:
+        with open(temp_path, "w") as file:
+            file.write(text)
+            file.flush()
+            os.fsync(file.fileno())
+        # keep the permissions of the file being replaced
+        try:
+            os.chmod(temp_path, stat.S_IMODE(os.stat(path).st_mode))
+        except FileNotFoundError:
+            pass
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+class BackgroundWriter:
+    """
+    A class that saves text files on a background thread.
+
+    Saves of the same file that are still waiting are merged, only the latest
+    content is written. The thread only reports results through a queue so it
+    never touches the UI, which must call get_results() from its own thread.
+
+    Attributes
+    ----------
+    on_disk : dict[str, tuple[int, int, bytes]]
+        (size, mtime_ns, digest) of the files this writer knows the content of
+    pending : dict[str, str]
+        Content waiting to be written, by path
+    results : queue.Queue
+        (path, written, error) of every finished save, where written is False
+        when the file already had that content and error is None on success
+
+    Methods
+    ----------
+    save(path, text)
+        Schedules a file to be saved
+    remember(path, text)
+        Records the content of a file that was just read
+    get_results()
+        Returns the results of the saves that finished since the last call
+    busy()
+        Returns whether some saves did not finish yet
+    close()
+        Waits for the pending saves and stops the thread
+    """
+    def __init__(self) -> None:
+        self.on_disk = dict()
+        self.pending = dict()
+        self.results = queue.Queue()
+        self.lock = threading.Lock()
+        self.wakeup = threading.Condition(self.lock)
+        self.writing = 0
+        self.closed = False
+        self.thread = threading.Thread(target=self.work, name="BackgroundWriter", daemon=True)
+        self.thread.start()
+
+    """
+    Schedules a file to be saved, returns immediately
+
+    Parameters
+    ----------
+    path : str
+        Path of the file
+    text : str
+        Content to save
+    """
+    def save(self, path: str, text: str) -> None:
+
+        with self.lock:
+            if self.closed:
+                raise RuntimeError("BackgroundWriter is closed")
+            self.pending[path] = text
+            self.wakeup.notify()
+
+    """
+    Records the content of a file that was just read, so saving it unchanged writes nothing
+
+    Parameters
+    ----------
+    path : str
+        Path of the file
+    text : str
+        Content that was read
+    """
+    def remember(self, path: str, text: str) -> None:
+
+        try:
+            file_stat = os.stat(path)
+        except OSError:
+            return
+        with self.lock:
+            self.on_disk[path] = (file_stat.st_size, file_stat.st_mtime_ns, digest(text))
+
+    """
+    Returns the results of the saves that finished since the last call
+
+    Returns
+    -------
+    list[tuple[str, bool, str | None]]
+        (path, written, error) of every finished save
+    """
+    def get_results(self) -> list[tuple[str, bool, str | None]]:
+
+        results = list()
+        while True:
+            try:
+                results.append(self.results.get_nowait())
+            except queue.Empty:
+                return results
+
+    """
+    Returns whether some saves did not finish yet
+    """
+    def busy(self) -> bool:
+
+        with self.lock:
+            return bool(self.pending) or self.writing > 0
+
+    """
+    Waits for the pending saves to finish and stops the thread
+    """
+    def close(self) -> None:
+
+        with self.lock:
+            self.closed = True
+            self.wakeup.notify()
+        self.thread.join()
+
+    """
+    Saves the pending files until the writer is closed
+    """
+    def work(self) -> None:
+
+        while True:
+            with self.lock:
+                while not self.pending and not self.closed:
+                    self.wakeup.wait()
+                if not self.pending:
+                    return
+                path = next(iter(self.pending))
+                text = self.pending.pop(path)
+                known = self.on_disk.get(path)
+                self.writing += 1
+
+            try:
+                written, record = self.save_now(path, text, known)
+            except (OSError, ValueError) as error:
+                with self.lock:
+                    self.on_disk.pop(path, None)
+                    self.writing -= 1
+                self.results.put((path, False, getattr(error, "strerror", None) or str(error)))
+            else:
+                with self.lock:
+                    self.on_disk[path] = record
+                    self.writing -= 1
+                self.results.put((path, written, None))
+
+    """
+    Writes a file unless it already has the given content
+
+    Parameters
+    ----------
+    path : str
+        Path of the file
+    text : str
+        Content to save
+    known : tuple[int, int, bytes] | None
+        What this writer last knew about the file
+
+    Returns
+    -------
+    tuple[bool, tuple[int, int, bytes]]
+        Whether the file was written, and what is now known about it
+    """
+    def save_now(self, path: str, text: str, known: tuple[int, int, bytes] | None) -> tuple[bool, tuple[int, int, bytes]]:
+
+        text_digest = digest(text)
+        try:
+            file_stat = os.stat(path)
+        except FileNotFoundError:
+            file_stat = None
+
+        if file_stat is not None:
+            if known is not None and known[:2] == (file_stat.st_size, file_stat.st_mtime_ns):
+                disk_digest = known[2]
+            else:
+                # changed outside of this writer, read it again
+                try:
+                    with open(path, "r") as file:
+                        disk_digest = digest(file.read())
+                except UnicodeDecodeError:
+                    disk_digest = None
+            if disk_digest == text_digest:
+                return False, (file_stat.st_size, file_stat.st_mtime_ns, disk_digest)
+
+        write_atomic(path, text)
+        file_stat = os.stat(path)
+        return True, (file_stat.st_size, file_stat.st_mtime_ns, text_digest)
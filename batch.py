@@ -0,0 +1,340 @@
+#########################################################################
+# Program description:                                                  #
+#   Batch execution of an IOL program over many input vectors. Since    #
+#   IOL has no control flow, every run executes the same statements,    #
+#   so each variable is kept as a NumPy int64 array holding its value   #
+#   in every run and each statement is executed once for all runs.      #
+#                                                                       #
+#   Usage: python batch.py PROGRAM.iol INPUTS.csv                       #
+#   Each row of INPUTS.csv holds the BEG inputs of one run, in order.   #
+#   Requires NumPy.                                                     #
+#########################################################################
+
+import csv
+import sys
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from iol import compile_source
+
+
+# per-run error codes, 0 means the run did not fail
+NO_ERROR = 0
+DIVISION_BY_ZERO = 1
+OVERFLOW = 2
+EXPECTED_INT = 3
+
+
+class BatchResult:
+    """
+    The result of executing a program over many input vectors.
+
+    Attributes
+    ----------
+    size : int
+        The number of runs
+    outputs : list[tuple[int, object]]
+        What was printed in order as (statement_index, values), where values is
+        "\n" for NEWLN or an array with the printed value of every run
+    variables : dict[str, numpy.ndarray]
+        The final value of every variable in every run
+    error_codes : numpy.ndarray
+        The error code of every run, NO_ERROR if it did not fail
+    error_variables : numpy.ndarray
+        For EXPECTED_INT errors, the variable that got the wrong input
+    failed_at : numpy.ndarray
+        Index of the statement where each run failed, len(program) if it did not
+
+    Methods
+    ----------
+    output(run)
+        Returns what a run printed
+    error(run)
+        Returns the error message of a run, None if it did not fail
+    """
+    def __init__(self, size: int, program_size: int) -> None:
+        self.size = size
+        self.outputs = list()
+        self.variables = dict()
+        self.error_codes = np.zeros(size, dtype=np.int8)
+        self.error_variables = np.full(size, None, dtype=object)
+        self.failed_at = np.full(size, program_size, dtype=np.int64)
+
+    """
+    Returns what a run printed until it finished or failed
+
+    Parameters
+    ----------
+    run : int
+        Index of the run
+
+    Returns
+    -------
+    str
+        The output of the run
+    """
+    def output(self, run: int) -> str:
+
+        failed_at = self.failed_at[run]
+        text = list()
+        for statement_index, values in self.outputs:
+            if statement_index >= failed_at:
+                break
+            text.append(values if type(values) == str else f"{values[run]}")
+        return "".join(text)
+
+    """
+    Returns the error message of a run, in the same words as the IDE console
+
+    Parameters
+    ----------
+    run : int
+        Index of the run
+
+    Returns
+    -------
+    str | None
+        The error message, None if the run did not fail
+    """
+    def error(self, run: int) -> str | None:
+
+        error_code = self.error_codes[run]
+        if error_code == DIVISION_BY_ZERO:
+            return "Division by zero."
+        elif error_code == OVERFLOW:
+            return "Integer overflow."
+        elif error_code == EXPECTED_INT:
+            return f"{self.error_variables[run]} expected an INT, got STR instead."
+        return None
+
+
+class BatchExecutor:
+    """
+    A class that executes a program once for many input vectors at the same time.
+
+    Integers are NumPy int64 instead of Python integers, so a run whose values
+    do not fit in 64 bits fails with an overflow error. A run that fails keeps
+    being computed with the other runs but its values are ignored from the
+    failing statement on.
+
+    Attributes
+    ----------
+    program : list[tuple]
+        Statements from CodeGenerator.generate()
+    sym_tbl : dict[str, list[str | int]]
+        The symbol table of the program
+    inputs_needed : list[str]
+        The variable read by each BEG statement, in order
+
+    Methods
+    ----------
+    run(inputs)
+        Executes the program for every input vector
+    """
+    def __init__(self, program: list[tuple], sym_tbl: dict[str, list[str | int]]) -> None:
+        if np is None:
+            raise ImportError("Batch execution requires NumPy, install it with 'pip install numpy'")
+        self.program = program
+        self.sym_tbl = sym_tbl
+        self.inputs_needed = [statement[1] for statement in program if statement[0] == "BEG"]
+
+    """
+    Executes the program for every input vector
+
+    Parameters
+    ----------
+    inputs : Sequence[Sequence[str | int]] | numpy.ndarray
+        One row per run, with one value per BEG statement in the order they are
+        executed. INT variables accept integers or strings of digits.
+
+    Returns
+    -------
+    BatchResult
+        The outputs, final variables and errors of every run
+    """
+    def run(self, inputs) -> BatchResult:
+
+        if isinstance(inputs, np.ndarray):
+            if inputs.ndim != 2 or inputs.shape[1] != len(self.inputs_needed):
+                raise ValueError(f"Expected an array of shape (runs, {len(self.inputs_needed)})")
+            size = inputs.shape[0]
+            columns = [inputs[:, i] for i in range(inputs.shape[1])]
+        else:
+            size = len(inputs)
+            for row in inputs:
+                if len(row) != len(self.inputs_needed):
+                    raise ValueError(f"Every input vector needs {len(self.inputs_needed)} value(s)")
+            columns = [np.array(column, dtype=object) for column in zip(*inputs)]
+            if len(columns) == 0:
+                columns = [np.empty(size, dtype=object) for _ in self.inputs_needed]
+
+        result = BatchResult(size, len(self.program))
+        variables = result.variables
+        for var, (var_type, default) in self.sym_tbl.items():
+            if var_type == "INT":
+                variables[var] = np.full(size, default, dtype=np.int64)
+            else:
+                variables[var] = np.full(size, default, dtype=object)
+
+        next_input = 0
+        with np.errstate(all="ignore"):
+            for statement_index, (operation, var, expr, line) in enumerate(self.program):
+                match operation:
+                    case "INT" | "STR" | "INTO":
+                        if expr is not None:
+                            variables[var] = self.evaluate(expr, variables, result, statement_index)
+                    case "BEG":
+                        column = columns[next_input]
+                        next_input += 1
+                        if self.sym_tbl[var][0] == "INT":
+                            variables[var] = self.read_ints(column, var, result, statement_index)
+                        else:
+                            variables[var] = column.astype(str).astype(object)
+                    case "PRINT":
+                        result.outputs.append((statement_index, self.evaluate(expr, variables, result, statement_index)))
+                    case "NEWLN":
+                        result.outputs.append((statement_index, "\n"))
+        return result
+
+    """
+    Records an error for the runs that did not fail yet
+    """
+    def fail(self, result: BatchResult, mask, error_code: int, statement_index: int) -> None:
+
+        mask = mask & (result.error_codes == NO_ERROR)
+        result.error_codes[mask] = error_code
+        result.failed_at[mask] = statement_index
+
+    """
+    Converts the inputs of an INT variable into an int64 array, failing runs with
+    invalid inputs, which are the ones the Interpreter rejects: anything but ASCII digits
+    """
+    def read_ints(self, column, var: str, result: BatchResult, statement_index: int):
+
+        values = np.zeros(len(column), dtype=np.int64)
+        if column.dtype.kind in "iu":
+            # a negative number is not made of digits, like a "-" typed as input
+            valid = column >= 0
+            if column.dtype.kind == "u":
+                too_big = column >= np.uint64(2 ** 63)
+                self.fail(result, too_big, OVERFLOW, statement_index)
+                valid &= ~too_big
+            values[valid] = column[valid]
+        elif len(column) == 0:
+            return values
+        else:
+            text = column.astype(str)
+            # isdigit() also accepts other digits like '²' that int() rejects, keep the ASCII ones
+            is_ascii = (text.view(np.uint32).reshape(len(text), -1) < 128).all(axis=1)
+            valid = np.char.isdigit(text) & is_ascii
+            self.read_digits(text, valid, values, result, statement_index)
+
+        invalid = ~valid & (result.error_codes == NO_ERROR)
+        result.error_variables[invalid] = var
+        self.fail(result, invalid, EXPECTED_INT, statement_index)
+        return values
+
+    """
+    Converts the strings of ASCII digits of an input column into values, failing runs whose number does not fit
+    """
+    def read_digits(self, text, valid, values, result: BatchResult, statement_index: int) -> None:
+
+        # more than 18 digits may not fit in an int64
+        long = valid & (np.char.str_len(text) > 18)
+        short = valid & ~long
+        values[short] = text[short].astype(np.int64)
+        for i in np.flatnonzero(long):
+            number = int(text[i])
+            if number >= 2 ** 63:
+                self.fail(result, np.arange(len(text)) == i, OVERFLOW, statement_index)
+            else:
+                values[i] = number
+
+    """
+    Evaluates an expression for every run
+
+    Parameters
+    ----------
+    expr : tuple
+        Tokens of the expression in prefix order
+
+    Returns
+    -------
+    numpy.ndarray
+        The value of the expression in every run
+    """
+    def evaluate(self, expr: tuple, variables: dict, result: BatchResult, statement_index: int):
+
+        # operands before their operator, like Interpreter.evaluate()
+        stack = list()
+        for kind, value in reversed(expr):
+            match kind:
+                case "IDENT":
+                    stack.append(variables[value])
+                case "INT_LIT":
+                    if value >= 2 ** 63:
+                        self.fail(result, np.ones(result.size, dtype=bool), OVERFLOW, statement_index)
+                        value = 0
+                    stack.append(np.full(result.size, value, dtype=np.int64))
+                case _:
+                    num1 = stack.pop()
+                    num2 = stack.pop()
+                    stack.append(self.apply(kind, num1, num2, result, statement_index))
+        # arrays are never modified in place so variables can share them
+        return stack.pop()
+
+    """
+    Applies an arithmetic operator, failing runs that divide by zero or overflow
+    """
+    def apply(self, op: str, num1, num2, result: BatchResult, statement_index: int):
+
+        match op:
+            case "ADD":
+                value = num1 + num2
+                overflow = ((num1 ^ value) & (num2 ^ value)) < 0
+            case "SUB":
+                value = num1 - num2
+                overflow = ((num1 ^ num2) & (num1 ^ value)) < 0
+            case "MULT":
+                value = num1 * num2
+                nonzero = np.where(num1 == 0, 1, num1)
+                overflow = (num1 != 0) & ((value // nonzero != num2) | ((num1 == -1) & (num2 == np.iinfo(np.int64).min)))
+            case "DIV" | "MOD":
+                zero = num2 == 0
+                divisor = np.where(zero, 1, num2)
+                self.fail(result, zero, DIVISION_BY_ZERO, statement_index)
+                if op == "DIV":
+                    value = np.floor_divide(num1, divisor)
+                    overflow = (num1 == np.iinfo(np.int64).min) & (divisor == -1)
+                else:
+                    value = np.mod(num1, divisor)
+                    overflow = None
+        if overflow is not None and overflow.any():
+            self.fail(result, overflow, OVERFLOW, statement_index)
+        return value
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python batch.py PROGRAM.iol INPUTS.csv", file=sys.stderr)
+        sys.exit(2)
+
+    with open(sys.argv[1], "r") as file:
+        source = file.read()
+    compilation = compile_source(source)
+    if compilation.program is None:
+        for message in compilation.diagnostics():
+            print(message, file=sys.stderr)
+        sys.exit(1)
+
+    with open(sys.argv[2], "r", newline="") as file:
+        inputs = [row for row in csv.reader(file)]
+
+    result = BatchExecutor(compilation.program, compilation.sym_tbl).run(inputs)
+    writer = csv.writer(sys.stdout)
+    writer.writerow(["run", "output", "error"])
+    for run in range(result.size):
+        writer.writerow([run, result.output(run), result.error(run) or ""])
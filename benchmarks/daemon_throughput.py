@@ -0,0 +1,152 @@
+#########################################################################
+# Program description:                                                  #
+#   Measures how many programs per second the daemon checks or runs,    #
+#   with several clients sending requests at the same time, against     #
+#   starting a new Python process for every program.                    #
+#                                                                       #
+#   Usage: python benchmarks/daemon_throughput.py [-n REQUESTS]         #
+#          [-c CLIENTS] [-j JOBS] [--method check|run] [FILE.iol ...]   #
+#########################################################################
+
+import argparse
+import glob
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+from daemon import DaemonClient
+
+
+# what a CI job without the daemon does for every program
+COLD = """
+from project import compile_source
+compile_source(open({path!r}).read())
+"""
+
+
+"""
+Starts a daemon on a temporary socket and waits until it answers
+
+Returns:
+    tuple[subprocess.Popen, str]: the daemon process and its socket
+"""
+def start_daemon(jobs: int | None) -> tuple[subprocess.Popen, str]:
+
+    path = os.path.join(tempfile.mkdtemp(), "iol-daemon.sock")
+    command = [sys.executable, os.path.join(REPO, "daemon.py"), "serve", "--socket", path]
+    if jobs:
+        command += ["-j", str(jobs)]
+    process = subprocess.Popen(command, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            client = DaemonClient(path)
+        except OSError:
+            time.sleep(0.05)
+            continue
+        # the first request waits until the workers are up
+        client.request("check", source="IOL LOI")
+        client.close()
+        return process, path
+    process.kill()
+    raise RuntimeError("The daemon did not start")
+
+
+"""
+Sends requests from several clients at once
+
+Args:
+    path (str): socket of the daemon
+    sources (list[str]): programs to send, in a cycle
+    requests (int): total number of requests
+    clients (int): number of concurrent connections
+    method (str): check or run
+
+Returns:
+    tuple[float, list[float]]: total seconds and the latency of every request
+"""
+def measure_daemon(path: str, sources: list[str], requests: int, clients: int, method: str) -> tuple[float, list[float]]:
+
+    latencies = list()
+    errors = list()
+    lock = threading.Lock()
+
+    def client_loop(index: int) -> None:
+        client = DaemonClient(path)
+        own = list()
+        for i in range(index, requests, clients):
+            start = time.perf_counter()
+            response = client.request(method, source=sources[i % len(sources)], inputs=["1"] * 16)
+            own.append(time.perf_counter() - start)
+            if "error" in response:
+                errors.append(response["error"])
+        client.close()
+        with lock:
+            latencies.extend(own)
+
+    threads = [threading.Thread(target=client_loop, args=(index,)) for index in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    total = time.perf_counter() - start
+    if errors:
+        print(f"{len(errors)} request(s) failed, e.g. {errors[0]}", file=sys.stderr)
+    return total, latencies
+
+
+"""
+Checks programs by starting a new Python process for each one
+
+Returns:
+    float: seconds per program
+"""
+def measure_cold(paths: list[str], runs: int) -> float:
+
+    start = time.perf_counter()
+    for i in range(runs):
+        script = COLD.format(path=paths[i % len(paths)])
+        subprocess.run([sys.executable, "-c", script], cwd=REPO, check=True, capture_output=True)
+    return (time.perf_counter() - start) / runs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure daemon throughput.")
+    parser.add_argument("files", nargs="*", default=sorted(glob.glob(os.path.join(REPO, "inputs", "*.iol"))))
+    parser.add_argument("-n", "--requests", type=int, default=5000)
+    parser.add_argument("-c", "--clients", type=int, default=8)
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="daemon worker processes (default: one per CPU)")
+    parser.add_argument("--method", choices=("check", "run"), default="check")
+    parser.add_argument("--cold-runs", type=int, default=20)
+    args = parser.parse_args()
+
+    paths = [os.path.abspath(path) for path in args.files]
+    sources = list()
+    for path in paths:
+        with open(path, "r") as file:
+            sources.append(file.read())
+
+    process, path = start_daemon(args.jobs)
+    try:
+        total, latencies = measure_daemon(path, sources, args.requests, args.clients, args.method)
+    finally:
+        process.terminate()
+        process.wait()
+    latencies.sort()
+
+    cold = measure_cold(paths, args.cold_runs)
+    print(f"{'mode':<10}{'programs/s':>14}{'p50 (ms)':>12}{'p99 (ms)':>12}")
+    print(f"{'cold':<10}{1 / cold:>14.1f}{cold * 1000:>12.1f}{'':>12}")
+    print(
+        f"{'daemon':<10}{len(latencies) / total:>14.1f}{statistics.median(latencies) * 1000:>12.2f}"
+        f"{latencies[int(len(latencies) * 0.99) - 1] * 1000:>12.2f}"
+    )
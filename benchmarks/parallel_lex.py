@@ -0,0 +1,183 @@
+#########################################################################
+# Program description:                                                  #
+#   Compares LexicalAnalyzer.tokenize() with tokenize_parallel() on a   #
+#   large source, for several numbers of processes, and checks that     #
+#   both give the same tokens, errors and symbol table. It also prints  #
+#   the time tokenize_parallel() spends in the parent process, which    #
+#   bounds the speedup however many CPUs there are. --fuzz compares     #
+#   both on random small sources full of errors instead.                #
+#                                                                       #
+#   Usage: python benchmarks/parallel_lex.py [-l LINES] [-j JOBS ...]   #
+#          [--fuzz TRIALS] [FILE.iol]                                   #
+#########################################################################
+
+import argparse
+import os
+import pickle
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+import iol
+from iol import LexicalAnalyzer, tokenize_chunk
+
+
+# words and separators of the fuzzed sources, with errors, undefined and duplicate variables
+FUZZ_WORDS = ("IOL", "LOI", "INT", "STR", "IS", "INTO", "BEG", "PRINT", "ADD", "MULT", "NEWLN", "5", "12", "x", "y", "z", "a1", "w!", "3q")
+FUZZ_SEPARATORS = (" ", "  ", "\t", "\n", "\n", "\r\n", "\r", "\x0c", "\x85", "\u2028")
+
+
+"""
+Returns a program with a few thousand variables used all over it
+
+Args:
+    lines (int): number of statement lines
+
+Returns:
+    str: the program
+"""
+def generate_source(lines: int) -> str:
+
+    variables = 5000
+    text = ["IOL\n"]
+    for i in range(variables):
+        text.append(f"INT v{i} IS {i} STR s{i}\n")
+    for i in range(lines):
+        text.append(f"INTO v{i % variables} IS ADD v{(i * 7) % variables} MULT {i} v{(i * 13) % variables}\n")
+        if i % 1000 == 0:
+            text.append(f"BEG s{i % variables} PRINT s{i % variables} NEWLN\n")
+    text.append("LOI\n")
+    return "".join(text)
+
+
+"""
+Returns everything tokenize() produces, to compare two runs
+"""
+def snapshot(lex: LexicalAnalyzer, sym_tbl: dict) -> tuple:
+
+    tokens = lex.tokens
+    return (
+        tokens.codes, tokens.values, tokens.lines, tokens.offsets, tokens.line_starts,
+        lex.get_errors(), list(sym_tbl.items()),
+    )
+
+
+class ReplayExecutor:
+    """
+    An executor that tokenizes the chunks in this process the first time and
+    returns the same pickled results every time after, so that timing
+    tokenize_parallel() with it measures only the work of the parent process:
+    splitting the source, unpickling the results and merging them.
+    """
+    def __init__(self) -> None:
+        self.results = None
+
+    def map(self, func, *iterables):
+        if self.results is None:
+            self.results = [pickle.dumps(func(*args), pickle.HIGHEST_PROTOCOL) for args in zip(*iterables)]
+        return map(pickle.loads, self.results)
+
+
+"""
+Returns the seconds tokenize_parallel() spends in the parent process
+
+Args:
+    source (str): the source to tokenize
+    jobs (int): number of processes the source is split for
+
+Returns:
+    float: the seconds
+"""
+def parent_time(source: str, jobs: int) -> float:
+
+    executor = ReplayExecutor()
+    LexicalAnalyzer().tokenize_parallel(source, dict(), jobs, executor=executor)
+    start = time.perf_counter()
+    LexicalAnalyzer().tokenize_parallel(source, dict(), jobs, executor=executor)
+    return time.perf_counter() - start
+
+
+"""
+Compares tokenize() with tokenize_parallel() on random small sources, split
+into chunks of a few lines
+
+Args:
+    trials (int): number of sources
+    jobs (int): number of processes
+
+Returns:
+    int: the number of sources with a different result
+"""
+def fuzz(trials: int, jobs: int) -> int:
+
+    iol.MIN_PARALLEL_CHARS = 64
+    rng = random.Random(0)
+    failures = 0
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for trial in range(trials):
+            source = "".join(
+                rng.choice(FUZZ_WORDS) + rng.choice(FUZZ_SEPARATORS) for _ in range(rng.randint(0, 400))
+            )
+            # variables defined before the source, like the IDE does between compilations
+            defined = {"y": ["INT", 0]} if trial % 3 == 0 else {}
+            lex = LexicalAnalyzer()
+            sym_tbl = dict(defined)
+            result = lex.tokenize(source, sym_tbl)
+            parallel_lex = LexicalAnalyzer()
+            parallel_sym_tbl = dict(defined)
+            parallel_result = parallel_lex.tokenize_parallel(source, parallel_sym_tbl, jobs, executor=pool)
+            if result != parallel_result or snapshot(lex, sym_tbl) != snapshot(parallel_lex, parallel_sym_tbl):
+                print(f"trial {trial} gave a different result than tokenize(): {source!r}", file=sys.stderr)
+                failures += 1
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure parallel lexing.")
+    parser.add_argument("file", nargs="?", default=None, help="source to tokenize (default: a generated one)")
+    parser.add_argument("-l", "--lines", type=int, default=500000, help="lines of the generated source")
+    parser.add_argument("-j", "--jobs", type=int, nargs="+", default=[2, 4, os.cpu_count() or 1])
+    parser.add_argument("--fuzz", type=int, default=0, metavar="TRIALS", help="compare on random sources instead")
+    args = parser.parse_args()
+
+    if args.fuzz:
+        failures = fuzz(args.fuzz, max(args.jobs))
+        print(f"{args.fuzz - failures}/{args.fuzz} random sources gave the same result")
+        sys.exit(1 if failures else 0)
+
+    if args.file is None:
+        source = generate_source(args.lines)
+    else:
+        with open(args.file, "r") as file:
+            source = file.read()
+
+    lex = LexicalAnalyzer()
+    sym_tbl = dict()
+    start = time.perf_counter()
+    lex.tokenize(source, sym_tbl)
+    sequential = time.perf_counter() - start
+    expected = snapshot(lex, sym_tbl)
+    print(f"{len(source)} characters, {len(lex.tokens)} tokens on {os.cpu_count()} CPU(s)")
+    # the parent's part does not get faster with more processes
+    print(f"{'processes':<12}{'seconds':>10}{'speedup':>10}{'parent (s)':>12}{'at most':>10}")
+    print(f"{'sequential':<12}{sequential:>10.3f}{1:>10.2f}")
+
+    for jobs in sorted(set(args.jobs)):
+        # the pool is started before timing, like a tool that keeps one around
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            list(pool.map(abs, range(jobs)))
+            parallel_lex = LexicalAnalyzer()
+            parallel_sym_tbl = dict()
+            start = time.perf_counter()
+            parallel_lex.tokenize_parallel(source, parallel_sym_tbl, jobs, executor=pool)
+            parallel = time.perf_counter() - start
+        if snapshot(parallel_lex, parallel_sym_tbl) != expected:
+            print(f"{jobs} processes gave a different result than tokenize()", file=sys.stderr)
+            sys.exit(1)
+        parent = parent_time(source, jobs)
+        print(f"{jobs:<12}{parallel:>10.3f}{sequential / parallel:>10.2f}{parent:>12.3f}{sequential / parent:>10.2f}")
@@ -0,0 +1,84 @@
+#########################################################################
+# Program description:                                                  #
+#   Measures how long it takes from starting Python to finishing the    #
+#   first compile, for tools that only import the compiler (headless)   #
+#   and for the IDE, which also imports tkinter and creates a window.   #
+#                                                                       #
+#   Usage: python benchmarks/startup.py [-n RUNS] [FILE.iol]            #
+#########################################################################
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# each script prints the time from before the first import to the end of the first compile
+HEADLESS = """
+import time
+start = time.perf_counter()
+from project import compile_source
+compile_source(open({path!r}).read())
+print(time.perf_counter() - start)
+"""
+
+GUI = """
+import time
+start = time.perf_counter()
+import tkinter as tk
+from ide import App
+from iol import compile_source
+root = tk.Tk()
+editor = App(root)
+editor.input_text.insert(tk.END, open({path!r}).read())
+compile_source(editor.input_text.get("1.0", tk.END), editor.lex, editor.syn, editor.codegen)
+root.update()
+print(time.perf_counter() - start)
+root.destroy()
+"""
+
+
+"""
+Runs a script in a new Python process several times
+
+Args:
+    script (str): the script to run, prints its own import-to-first-compile time
+    runs (int): how many times to run it
+
+Returns:
+    tuple[list[float], list[float]] | None: process times and import-to-compile times,
+    None if the script failed (e.g. no display for the IDE)
+"""
+def measure(script: str, runs: int) -> tuple[list[float], list[float]] | None:
+
+    process_times = list()
+    compile_times = list()
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-c", script], cwd=REPO, capture_output=True, text=True)
+        process_times.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            print(result.stderr.strip().splitlines()[-1], file=sys.stderr)
+            return None
+        compile_times.append(float(result.stdout))
+    return process_times, compile_times
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure import-to-first-compile latency.")
+    parser.add_argument("file", nargs="?", default=os.path.join(REPO, "inputs", "test.iol"))
+    parser.add_argument("-n", "--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'path':<10}{'process (ms)':>16}{'import to compile (ms)':>26}")
+    for name, script in (("headless", HEADLESS), ("gui", GUI)):
+        times = measure(script.format(path=os.path.abspath(args.file)), args.runs)
+        if times is None:
+            print(f"{name:<10}{'unavailable':>16}")
+            continue
+        process_times, compile_times = times
+        print(f"{name:<10}{statistics.median(process_times) * 1000:>16.1f}{statistics.median(compile_times) * 1000:>26.1f}")
@@ -0,0 +1,340 @@
+#########################################################################
+# Program description:                                                  #
+#   Incremental builder for directories of IOL programs. Every .iol     #
+#   file is compiled into its .tkn file and a compiled form, and the    #
+#   results are recorded in a manifest so that only files that changed  #
+#   since the last build are compiled again.                            #
+#                                                                       #
+#   Usage: python build.py DIRECTORY [-j JOBS] [--force]                #
+#########################################################################
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from iol import LexicalAnalyzer, SyntaxAnalyzer, CodeGenerator, compile_source
+
+
+# bump this when the content of the manifest or of the compiled forms changes
+BUILD_FORMAT = 1
+BUILD_DIR = ".iolbuild"
+MANIFEST_NAME = "manifest.json"
+
+# below this many dirty files, starting a process pool costs more than it saves
+MIN_PARALLEL_FILES = 8
+
+# analyzers of the current process, created once per worker
+lex = None
+syn = None
+codegen = None
+
+
+"""
+Creates the analyzers used by build_file() in the current process
+"""
+def init_worker() -> None:
+
+    global lex, syn, codegen
+    lex = LexicalAnalyzer()
+    syn = SyntaxAnalyzer()
+    codegen = CodeGenerator()
+
+
+"""
+Compiles one .iol file and writes its .tkn file
+
+Args:
+    path (str): path of the .iol file
+
+Returns:
+    dict: the manifest entry of the file with its compiled form under "compiled",
+    files that cannot be read have their error in "diagnostics" and no .tkn file
+"""
+def build_file(path: str) -> dict:
+
+    if lex is None:
+        init_worker()
+
+    stat = None
+    data = b""
+    try:
+        stat = os.stat(path)
+        with open(path, "rb") as file:
+            data = file.read()
+        source = data.decode("utf-8")
+    except (OSError, UnicodeDecodeError) as error:
+        # one bad file must not stop the build of the others
+        return {
+            "size": -1 if stat is None else stat.st_size,
+            "mtime_ns": -1 if stat is None else stat.st_mtime_ns,
+            "hash": hashlib.sha256(data).hexdigest(),
+            "tkn": None,
+            "diagnostics": [f"Could not read the file: {error}"],
+            "compiled": None,
+        }
+
+    compilation = compile_source(source, lex, syn, codegen)
+    diagnostics = compilation.diagnostics()
+    tkn_file_path = path[:-3] + "tkn"
+    try:
+        with open(tkn_file_path, "w") as file:
+            file.write(compilation.tokenized_code)
+    except OSError as error:
+        # the .tkn file is missing, so the next build tries again
+        diagnostics.append(f"Could not write {os.path.basename(tkn_file_path)}: {error}")
+
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "hash": hashlib.sha256(data).hexdigest(),
+        "tkn": os.path.basename(tkn_file_path),
+        "diagnostics": diagnostics,
+        "compiled": None if diagnostics else {"tokens": list(compilation.tokens), "sym_tbl": compilation.sym_tbl},
+    }
+
+
+class Builder:
+    """A class that incrementally builds every .iol file under a directory.
+
+    Attributes:
+        root (str): the directory to build
+        build_dir (str): where the manifest and compiled forms are kept
+        manifest (dict[str, dict]): manifest entries by path relative to root
+        manifest_changed (bool): whether the manifest must be written again
+        jobs (int | None): number of worker processes, None for one per CPU
+
+    Methods:
+        build(force): compiles the files that changed and returns a summary
+    """
+    def __init__(self, root: str, jobs: int | None = None) -> None:
+        self.root = root
+        self.build_dir = os.path.join(root, BUILD_DIR)
+        self.jobs = jobs
+        self.manifest = self.load_manifest()
+        self.manifest_changed = False
+
+    """Loads the manifest of the last build, or an empty one if it is missing or outdated
+
+    Returns:
+        dict[str, dict]: manifest entries by relative path
+    """
+    def load_manifest(self) -> dict[str, dict]:
+
+        try:
+            with open(os.path.join(self.build_dir, MANIFEST_NAME), "r") as file:
+                manifest = json.load(file)
+        except (OSError, ValueError):
+            return dict()
+        if manifest.get("format") != BUILD_FORMAT:
+            return dict()
+        return manifest["files"]
+
+    """Writes the manifest atomically so an interrupted build never leaves a broken one
+    """
+    def save_manifest(self) -> None:
+
+        path = os.path.join(self.build_dir, MANIFEST_NAME)
+        with open(path + ".tmp", "w") as file:
+            json.dump({"format": BUILD_FORMAT, "files": self.manifest}, file, separators=(",", ":"))
+        os.replace(path + ".tmp", path)
+
+    """Returns every .iol file under root with its stat result
+
+    Returns:
+        dict[str, os.stat_result | None]: stat results by relative path, None for
+        files that cannot be stat'ed, like dangling symlinks, which build_file() reports
+    """
+    def find_sources(self) -> dict[str, os.stat_result | None]:
+
+        sources = dict()
+        directories = [self.root]
+        while directories:
+            directory = directories.pop()
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name != BUILD_DIR:
+                            directories.append(entry.path)
+                    elif entry.name.endswith(".iol"):
+                        try:
+                            stat = entry.stat()
+                        except OSError:
+                            stat = None
+                        sources[os.path.relpath(entry.path, self.root)] = stat
+        return sources
+
+    """Checks whether a file must be compiled again
+
+    A file whose size and modification time did not change is considered clean
+    without reading it. Otherwise it is hashed and only compiled again if its
+    content changed. Files that could not be read are always tried again.
+
+    Args:
+        rel_path (str): path relative to root
+        stat (os.stat_result | None): current stat result of the file, None if it failed
+
+    Returns:
+        bool: True if the file must be compiled
+    """
+    def is_dirty(self, rel_path: str, stat: os.stat_result) -> bool:
+
+        entry = self.manifest.get(rel_path)
+        # a file that could not be read has no .tkn file, and fixing its permissions does
+        # not change its modification time, such files are rare so reading them again is cheap
+        if entry is None or stat is None or entry["tkn"] is None:
+            return True
+        tkn_missing = not os.path.exists(os.path.join(self.root, os.path.dirname(rel_path), entry["tkn"]))
+        if entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return tkn_missing
+
+        try:
+            with open(os.path.join(self.root, rel_path), "rb") as file:
+                if hashlib.sha256(file.read()).hexdigest() != entry["hash"]:
+                    return True
+        except OSError:
+            # build_file() records the error
+            return True
+        # touched but not changed
+        entry["size"] = stat.st_size
+        entry["mtime_ns"] = stat.st_mtime_ns
+        self.manifest_changed = True
+        return tkn_missing
+
+    """Compiles every .iol file that changed since the last build
+
+    Args:
+        force (bool): compile every file even if it did not change
+
+    Returns:
+        dict: summary of the build
+    """
+    def build(self, force: bool = False) -> dict:
+
+        start = time.perf_counter()
+        self.manifest_changed = False
+        sources = self.find_sources()
+
+        removed = [rel_path for rel_path in self.manifest if rel_path not in sources]
+        for rel_path in removed:
+            self.remove_compiled(self.manifest.pop(rel_path))
+            self.manifest_changed = True
+
+        dirty = [rel_path for rel_path, stat in sources.items() if force or self.is_dirty(rel_path, stat)]
+        dirty.sort()
+
+        if dirty:
+            os.makedirs(self.build_dir, exist_ok=True)
+            paths = [os.path.join(self.root, rel_path) for rel_path in dirty]
+            if len(dirty) < MIN_PARALLEL_FILES or self.jobs == 1:
+                results = map(build_file, paths)
+                self.store_results(dirty, results)
+            else:
+                with ProcessPoolExecutor(max_workers=self.jobs, initializer=init_worker) as pool:
+                    chunksize = max(1, len(dirty) // ((self.jobs or os.cpu_count() or 1) * 4))
+                    self.store_results(dirty, pool.map(build_file, paths, chunksize=chunksize))
+            self.manifest_changed = True
+
+        if self.manifest_changed:
+            os.makedirs(self.build_dir, exist_ok=True)
+            self.save_manifest()
+
+        failed = {
+            rel_path: self.manifest[rel_path]["diagnostics"]
+            for rel_path in sorted(self.manifest)
+            if self.manifest[rel_path]["diagnostics"]
+        }
+        return {
+            "files": len(sources),
+            "built": len(dirty),
+            "up_to_date": len(sources) - len(dirty),
+            "removed": len(removed),
+            "failed": failed,
+            "seconds": time.perf_counter() - start,
+        }
+
+    """Records the results of compiled files in the manifest and writes their compiled forms
+
+    Args:
+        rel_paths (list[str]): paths relative to root
+        results (Iterable[dict]): results of build_file() in the same order
+    """
+    def store_results(self, rel_paths: list[str], results) -> None:
+
+        for rel_path, entry in zip(rel_paths, results):
+            old_entry = self.manifest.get(rel_path)
+            compiled = entry.pop("compiled")
+            if compiled is not None:
+                entry["compiled"] = entry["hash"] + ".json"
+                with open(os.path.join(self.build_dir, entry["compiled"]), "w") as file:
+                    json.dump(compiled, file, separators=(",", ":"))
+            else:
+                entry["compiled"] = None
+            self.manifest[rel_path] = entry
+            if old_entry is not None and old_entry["compiled"] != entry["compiled"]:
+                self.remove_compiled(old_entry)
+
+    """Deletes the compiled form of a manifest entry unless another file still uses it
+    """
+    def remove_compiled(self, entry: dict) -> None:
+
+        if entry["compiled"] is None:
+            return
+        if any(other["compiled"] == entry["compiled"] for other in self.manifest.values()):
+            return
+        try:
+            os.remove(os.path.join(self.build_dir, entry["compiled"]))
+        except FileNotFoundError:
+            pass
+
+
+"""
+Returns the compiled form of a built file, None if it has errors or is not built
+
+Args:
+    root (str): the built directory
+    rel_path (str): path of the .iol file relative to root
+
+Returns:
+    dict | None: {"tokens": [...], "sym_tbl": {...}}
+"""
+def load_compiled(root: str, rel_path: str) -> dict | None:
+
+    entry = Builder(root).manifest.get(rel_path)
+    if entry is None or entry["compiled"] is None:
+        return None
+    with open(os.path.join(root, BUILD_DIR, entry["compiled"]), "r") as file:
+        compiled = json.load(file)
+    compiled["tokens"] = [tuple(token) for token in compiled["tokens"]]
+    return compiled
+
+
+"""
+Prints the summary of a build
+"""
+def print_summary(summary: dict) -> None:
+
+    for rel_path, diagnostics in summary["failed"].items():
+        print(f"{rel_path}:")
+        for diagnostic in diagnostics:
+            print(f"    {diagnostic}")
+    print(
+        f"{summary['files']} file(s): {summary['built']} built, {summary['up_to_date']} up to date, "
+        f"{summary['removed']} removed, {len(summary['failed'])} with error(s) "
+        f"in {summary['seconds']:.3f}s"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Incrementally compile every .iol file in a directory.")
+    parser.add_argument("directory", help="directory containing .iol files")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="number of worker processes (default: one per CPU)")
+    parser.add_argument("--force", action="store_true", help="compile every file even if it did not change")
+    args = parser.parse_args()
+
+    summary = Builder(args.directory, args.jobs).build(args.force)
+    print_summary(summary)
+    sys.exit(1 if summary["failed"] else 0)
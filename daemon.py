@@ -0,0 +1,651 @@
+#########################################################################
+# Program description:                                                  #
+#   A long-running daemon that compiles, checks and runs IOL programs   #
+#   for other processes on the same machine. Worker processes keep      #
+#   their analyzers and compiled programs in memory between requests,   #
+#   so tools like CI that submit thousands of small programs do not     #
+#   pay for starting Python and building analyzers every time.          #
+#                                                                       #
+#   Protocol: one JSON object per line over a Unix socket.              #
+#     request:  {"id": 1, "method": "check" | "compile" | "run" |       #
+#                "ping", "source": "...", "inputs": [...],              #
+#                "timeout": seconds}                                    #
+#     response: {"id": 1, "result": {...}} or {"id": 1, "error": "..."} #
+#                                                                       #
+#   Usage: python daemon.py serve [-j JOBS] [--timeout SECONDS]         #
+#                                 [--cache FILE]                        #
+#          python daemon.py check|compile FILE.iol                      #
+#          python daemon.py run FILE.iol [--input VALUE ...]            #
+#          python daemon.py ping                                        #
+#   Every command takes --socket PATH to use another socket.            #
+#########################################################################
+
+import argparse
+import hashlib
+import json
+import math
+import multiprocessing
+import os
+import queue
+import signal
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+from iol import LexicalAnalyzer, SyntaxAnalyzer, CodeGenerator, Interpreter, IOLRuntimeError, ExecutionLimits, compile_source
+from result_cache import MAX_JSON_BITS, ResultCache, program_hash
+
+
+DEFAULT_SOCKET = os.path.join(
+    os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir(), f"iol-daemon-{os.getuid()}.sock"
+)
+# seconds a request may take, including the time it waits for a worker
+DEFAULT_TIMEOUT = 10.0
+MAX_TIMEOUT = 300.0
+# seconds respond() waits past the deadline of a request for its worker's answer
+RESPONSE_GRACE = 5.0
+# requests waiting for a worker before new requests are refused
+DEFAULT_BACKLOG = 256
+# compiled programs kept by each worker
+COMPILED_CACHE_SIZE = 256
+
+METHODS = ("check", "compile", "run")
+
+
+class Compiler:
+    """
+    The analyzers and compiled programs of one worker process.
+
+    Attributes
+    ----------
+    lex : LexicalAnalyzer
+    syn : SyntaxAnalyzer
+    codegen : CodeGenerator
+    compiled : OrderedDict[bytes, dict]
+        The most recently used compilation results by hash of the source
+    limits : ExecutionLimits
+        The limits of run requests
+    cache : ResultCache | None
+        Results of earlier runs, shared by every worker
+
+    Methods
+    ----------
+    compile(source)
+        Returns the compilation result of a source, cached
+    handle(request)
+        Returns the result of a check, compile or run request
+    """
+    def __init__(self, cache_size: int = COMPILED_CACHE_SIZE, limits: ExecutionLimits | None = None, cache: ResultCache | None = None) -> None:
+        # responses are JSON, keep the integers short enough to be converted to strings
+        self.limits = ExecutionLimits(max_bits=MAX_JSON_BITS) if limits is None else limits
+        self.cache = cache
+        self.lex = LexicalAnalyzer()
+        self.syn = SyntaxAnalyzer()
+        self.codegen = CodeGenerator()
+        self.compiled = OrderedDict()
+        self.cache_size = cache_size
+
+    """
+    Compiles a source, or returns the result of the last time it was compiled
+
+    Parameters
+    ----------
+    source : str
+        The IOL program
+
+    Returns
+    -------
+    dict
+        "diagnostics", "tokenized_code", "sym_tbl", "program", which is None
+        when there are diagnostics, and "hash" of the program
+    """
+    def compile(self, source: str) -> dict:
+
+        key = hashlib.sha256(source.encode("utf-8", "surrogatepass")).digest()
+        compiled = self.compiled.get(key)
+        if compiled is not None:
+            self.compiled.move_to_end(key)
+            return compiled
+
+        compilation = compile_source(source, self.lex, self.syn, self.codegen)
+        program = compilation.program
+        compiled = {
+            "diagnostics": compilation.diagnostics(),
+            "tokenized_code": compilation.tokenized_code,
+            "sym_tbl": compilation.sym_tbl,
+            "program": program,
+            "hash": None if program is None else program_hash(program, compilation.sym_tbl),
+        }
+        self.compiled[key] = compiled
+        if len(self.compiled) > self.cache_size:
+            self.compiled.popitem(last=False)
+        return compiled
+
+    """
+    Returns the result of a check, compile or run request
+
+    Parameters
+    ----------
+    request : dict
+        The request, with a valid "method" and a "source"
+
+    Returns
+    -------
+    dict
+        The response without its "id"
+    """
+    def handle(self, request: dict) -> dict:
+
+        source = request.get("source")
+        if type(source) != str:
+            return {"error": "Missing 'source'."}
+        compiled = self.compile(source)
+        result = {"diagnostics": compiled["diagnostics"]}
+
+        match request["method"]:
+            case "compile":
+                result["tokenized_code"] = compiled["tokenized_code"]
+                result["symbols"] = {var: compiled["sym_tbl"][var][0] for var in compiled["sym_tbl"]}
+            case "run":
+                if compiled["program"] is None:
+                    return {"result": result}
+                limits = self.limits
+                time_left = request.get("time_left")
+                if time_left is not None:
+                    # give up a little before the pool does, so this worker is not killed
+                    max_seconds = time_left * 0.9
+                    if limits.max_seconds is not None:
+                        max_seconds = min(max_seconds, limits.max_seconds)
+                    limits = ExecutionLimits(limits.max_operations, limits.max_bits, limits.max_output, max_seconds)
+                inputs = [str(value) for value in request.get("inputs") or ()]
+                if self.cache is not None:
+                    run_result, result["cached"] = self.cache.run(
+                        compiled["program"], compiled["sym_tbl"], inputs, limits, compiled["hash"]
+                    )
+                    result.update(run_result)
+                    return {"result": result}
+
+                remaining = iter(inputs)
+                output = list()
+                interpreter = Interpreter(lambda var: next(remaining, None), output.append, limits)
+                try:
+                    interpreter.run(compiled["program"], compiled["sym_tbl"])
+                    result["error"] = None
+                except IOLRuntimeError as error:
+                    result["error"] = str(error)
+                result["output"] = "".join(output)
+                result["variables"] = interpreter.variables
+        return {"result": result}
+
+
+"""
+Serves the requests sent by the pool through a pipe until the pipe is closed
+
+Args:
+    conn (multiprocessing.connection.Connection): the worker's end of the pipe
+    limits (ExecutionLimits | None): the limits of run requests
+    cache_path (str | None): SQLite file of the ResultCache, None to always run programs
+    cache_bytes (int | None): maximum size of the ResultCache
+"""
+def worker_main(conn, limits: ExecutionLimits | None = None, cache_path: str | None = None, cache_bytes: int | None = None) -> None:
+
+    cache = None if cache_path is None else ResultCache(cache_path, cache_bytes)
+    compiler = Compiler(limits=limits, cache=cache)
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        try:
+            response = compiler.handle(request)
+        except Exception as error:
+            response = {"error": f"Internal error: {error!r}"}
+        conn.send(response)
+
+
+class WorkerPool:
+    """A class that runs requests on worker processes.
+
+    Requests wait in a bounded queue, so when the workers fall behind submit()
+    blocks and stops the server from reading more requests. Every worker has a
+    thread that feeds it one request at a time; a worker that does not answer
+    before the request's deadline is killed and replaced.
+
+    Attributes:
+        size (int): number of worker processes
+        jobs (queue.Queue): requests waiting for a worker as (request, future, deadline)
+        completed (int): requests answered by the workers
+        timed_out (int): requests that did not finish before their deadline
+        limits (ExecutionLimits | None): the limits of run requests, given to the workers
+        cache_path (str | None): SQLite file of the ResultCache of the workers, None for no cache
+        cache_bytes (int | None): maximum size of the ResultCache
+
+    Methods:
+        submit(request, deadline): queues a request and returns a Future of its response
+        close(): stops the workers
+    """
+    def __init__(self, size: int, backlog: int = DEFAULT_BACKLOG, limits: ExecutionLimits | None = None, cache_path: str | None = None, cache_bytes: int | None = None) -> None:
+        self.size = size
+        self.limits = limits
+        self.cache_path = cache_path
+        self.cache_bytes = cache_bytes
+        self.jobs = queue.Queue(maxsize=backlog)
+        self.context = multiprocessing.get_context("spawn")
+        self.completed = 0
+        self.timed_out = 0
+        self.threads = [threading.Thread(target=self.feed_worker, daemon=True) for _ in range(size)]
+        for thread in self.threads:
+            thread.start()
+
+    """Queues a request, waiting for room in the queue until its deadline
+
+    Args:
+        request (dict): the request
+        deadline (float): time.monotonic() by which the response is needed
+
+    Raises:
+        queue.Full: when the queue stayed full until the deadline
+
+    Returns:
+        Future: the response
+    """
+    def submit(self, request: dict, deadline: float) -> Future:
+
+        future = Future()
+        self.jobs.put((request, future, deadline), timeout=max(0.0, deadline - time.monotonic()))
+        return future
+
+    """Starts a worker process
+
+    Returns:
+        tuple: the process and the pool's end of its pipe
+    """
+    def start_worker(self) -> tuple:
+
+        conn, worker_conn = self.context.Pipe()
+        process = self.context.Process(target=worker_main, args=(worker_conn, self.limits, self.cache_path, self.cache_bytes), daemon=True)
+        process.start()
+        worker_conn.close()
+        return process, conn
+
+    """Kills a worker process and starts another one
+
+    Args:
+        process (multiprocessing.Process): the worker
+        conn (multiprocessing.connection.Connection): the pool's end of its pipe
+
+    Returns:
+        tuple: the new process and the pool's end of its pipe
+    """
+    def restart_worker(self, process, conn) -> tuple:
+
+        process.kill()
+        process.join()
+        conn.close()
+        return self.start_worker()
+
+    """Feeds requests to one worker process until the pool is closed
+    """
+    def feed_worker(self) -> None:
+
+        process, conn = self.start_worker()
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            request, future, deadline = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                response, process, conn = self.run_job(request, deadline, process, conn)
+            except Exception as error:
+                # this thread is the only one feeding its worker, answer and go on with a fresh worker
+                future.set_result({"error": f"Internal error: {error!r}"})
+                process, conn = self.restart_worker(process, conn)
+                continue
+            future.set_result(response)
+
+        conn.close()
+        process.join(timeout=1)
+        if process.is_alive():
+            process.kill()
+
+    """Sends a request to a worker and waits for its response until the deadline
+
+    Args:
+        request (dict): the request
+        deadline (float): time.monotonic() by which the response is needed
+        process (multiprocessing.Process): the worker
+        conn (multiprocessing.connection.Connection): the pool's end of its pipe
+
+    Returns:
+        tuple: the response, and the worker and its pipe, which are new if it was replaced
+    """
+    def run_job(self, request: dict, deadline: float, process, conn) -> tuple:
+
+        if deadline <= time.monotonic():
+            self.timed_out += 1
+            return {"error": "Request timed out while waiting for a worker."}, process, conn
+
+        request["time_left"] = deadline - time.monotonic()
+        try:
+            conn.send(request)
+        except OSError:
+            # the worker died while idle, e.g. killed by the OOM killer, try once more on a new one
+            process, conn = self.restart_worker(process, conn)
+            request["time_left"] = max(0.0, deadline - time.monotonic())
+            conn.send(request)
+        try:
+            answered = conn.poll(max(0.0, deadline - time.monotonic()))
+            response = conn.recv() if answered else None
+        except (EOFError, OSError):
+            response = {"error": "Worker crashed while handling the request."}
+
+        if response is None or not process.is_alive():
+            # the worker is stuck or dead, replace it
+            process, conn = self.restart_worker(process, conn)
+        if response is None:
+            self.timed_out += 1
+            response = {"error": f"Request timed out after {request['timeout']:g}s."}
+        else:
+            self.completed += 1
+        return response, process, conn
+
+    """Stops the workers once the queued requests are done
+    """
+    def close(self) -> None:
+
+        for _ in self.threads:
+            self.jobs.put(None)
+        for thread in self.threads:
+            thread.join()
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """Handles one client connection, answering its requests in order"""
+
+    def handle(self) -> None:
+        try:
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                response = self.server.respond(line)
+                try:
+                    data = json.dumps(response, separators=(",", ":"))
+                except ValueError:
+                    # only possible with a --max-bits over MAX_JSON_BITS
+                    data = json.dumps({"id": response.get("id"), "error": "Result too large to send."})
+                self.wfile.write(data.encode() + b"\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # the client left without waiting for its responses
+            pass
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """A class that accepts clients on a Unix socket and sends their requests to a WorkerPool.
+
+    Attributes:
+        pool (WorkerPool): the workers
+        timeout_default (float): seconds a request may take when it does not say
+        started (float): time.monotonic() when the server started
+
+    Methods:
+        respond(line): returns the response to one line of the protocol
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, path: str, pool: WorkerPool, timeout: float = DEFAULT_TIMEOUT) -> None:
+        self.pool = pool
+        self.timeout_default = timeout
+        self.started = time.monotonic()
+        super().__init__(path, RequestHandler)
+        os.chmod(path, 0o600)
+
+    """Returns the response to one line of the protocol
+
+    Args:
+        line (bytes): a JSON request
+
+    Returns:
+        dict: the JSON response
+    """
+    def respond(self, line: bytes) -> dict:
+
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return {"id": None, "error": "Invalid JSON."}
+        if type(request) != dict:
+            return {"id": None, "error": "A request must be a JSON object."}
+
+        request_id = request.get("id")
+        method = request.get("method")
+        if method == "ping":
+            return {"id": request_id, "result": self.status()}
+        if method not in METHODS:
+            return {"id": request_id, "error": f"Unknown method '{method}'."}
+
+        try:
+            timeout = float(request.get("timeout", self.timeout_default))
+        except (TypeError, ValueError):
+            timeout = math.nan
+        # JSON allows NaN and Infinity, which no deadline can be computed from
+        if not (math.isfinite(timeout) and timeout > 0):
+            return {"id": request_id, "error": "'timeout' must be a positive number."}
+        timeout = min(timeout, MAX_TIMEOUT)
+        request["timeout"] = timeout
+        deadline = time.monotonic() + timeout
+        try:
+            future = self.pool.submit(request, deadline)
+        except queue.Full:
+            return {"id": request_id, "error": "Server busy, try again later."}
+        try:
+            # the worker's feeder answers by the deadline, this only guards against it never answering
+            response = future.result(timeout=timeout + RESPONSE_GRACE)
+        except FutureTimeoutError:
+            if future.cancel():
+                self.pool.timed_out += 1
+            response = {"error": f"Request timed out after {timeout:g}s."}
+        response["id"] = request_id
+        return response
+
+    """Returns the state of the server for ping requests
+    """
+    def status(self) -> dict:
+
+        return {
+            "workers": self.pool.size,
+            "queued": self.pool.jobs.qsize(),
+            "completed": self.pool.completed,
+            "timed_out": self.pool.timed_out,
+            "uptime": time.monotonic() - self.started,
+        }
+
+
+"""
+Removes the socket of a daemon that is no longer running
+
+Raises:
+    RuntimeError: when a daemon is still listening on the socket
+"""
+def remove_stale_socket(path: str) -> None:
+
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.remove(path)
+    else:
+        raise RuntimeError(f"A daemon is already listening on {path}")
+    finally:
+        probe.close()
+
+
+class DaemonClient:
+    """A class that sends requests to a running daemon.
+
+    Attributes:
+        path (str): the socket of the daemon
+
+    Methods:
+        request(method, **params): sends a request and returns its response
+        close(): closes the connection
+    """
+    def __init__(self, path: str = DEFAULT_SOCKET) -> None:
+        self.path = path
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.connect(path)
+        self.file = self.socket.makefile("rwb")
+        self.next_id = 0
+
+    """Sends a request and waits for its response
+
+    Args:
+        method (str): check, compile, run or ping
+        **params: the other fields of the request, e.g. source, inputs, timeout
+
+    Raises:
+        ConnectionError: when the daemon closed the connection
+
+    Returns:
+        dict: the response, with either "result" or "error"
+    """
+    def request(self, method: str, **params) -> dict:
+
+        self.next_id += 1
+        request = {"id": self.next_id, "method": method, **params}
+        self.file.write(json.dumps(request, separators=(",", ":")).encode() + b"\n")
+        self.file.flush()
+        line = self.file.readline()
+        if not line:
+            raise ConnectionError("The daemon closed the connection")
+        return json.loads(line)
+
+    def close(self) -> None:
+        self.file.close()
+        self.socket.close()
+
+
+"""
+Starts the daemon and serves until interrupted
+"""
+def serve(args) -> None:
+
+    try:
+        remove_stale_socket(args.socket)
+    except RuntimeError as error:
+        print(error, file=sys.stderr)
+        sys.exit(1)
+
+    limits = ExecutionLimits(
+        args.max_operations or None, args.max_bits or None, args.max_output or None, None
+    )
+    if args.cache is not None:
+        # create the file and check its version once, before the workers open it
+        ResultCache(args.cache, args.cache_size * 1024 * 1024).close()
+    pool = WorkerPool(args.jobs or os.cpu_count() or 1, args.backlog, limits, args.cache, args.cache_size * 1024 * 1024)
+    server = DaemonServer(args.socket, pool, args.timeout)
+    # stop cleanly on kill too, so the socket is removed
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    print(f"IOL daemon listening on {args.socket} with {pool.size} worker(s)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.remove(args.socket)
+        pool.close()
+
+
+"""
+Sends one request for a file and prints the response like the IDE console
+
+Returns:
+    int: the exit code, 0 when the program has no errors
+"""
+def send(args) -> int:
+
+    params = dict()
+    if args.method != "ping":
+        with open(args.file, "r") as file:
+            params["source"] = file.read()
+        if args.timeout is not None:
+            params["timeout"] = args.timeout
+    if args.method == "run":
+        params["inputs"] = args.input
+
+    try:
+        client = DaemonClient(args.socket)
+    except OSError as error:
+        print(f"Could not connect to the daemon at {args.socket}: {error.strerror or error}", file=sys.stderr)
+        return 2
+    try:
+        response = client.request(args.method, **params)
+    finally:
+        client.close()
+
+    if "error" in response:
+        print(response["error"], file=sys.stderr)
+        return 2
+    result = response["result"]
+    if args.method == "ping":
+        print(json.dumps(result, indent=2))
+        return 0
+
+    for diagnostic in result["diagnostics"]:
+        print(diagnostic, file=sys.stderr)
+    if args.method == "compile":
+        tkn_file_path = args.file[:-3] + "tkn"
+        with open(tkn_file_path, "w") as file:
+            file.write(result["tokenized_code"])
+        print(f"Tokenized version of the source code saved in {tkn_file_path}", file=sys.stderr)
+    if result["diagnostics"]:
+        return 1
+    if args.method == "run":
+        sys.stdout.write(result["output"])
+        if result["error"] is not None:
+            print(f"\n\nProgram terminated with error: {result['error']}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compile, check and run IOL programs through a warm daemon.")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--socket", default=DEFAULT_SOCKET, help=f"Unix socket of the daemon (default: {DEFAULT_SOCKET})")
+    commands = parser.add_subparsers(dest="method", required=True)
+
+    serve_parser = commands.add_parser("serve", parents=[common], help="start the daemon")
+    serve_parser.add_argument("-j", "--jobs", type=int, default=None, help="number of worker processes (default: one per CPU)")
+    serve_parser.add_argument("--backlog", type=int, default=DEFAULT_BACKLOG, help="requests that may wait for a worker")
+    serve_parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="default seconds per request")
+    default_limits = ExecutionLimits(max_bits=MAX_JSON_BITS)
+    serve_parser.add_argument("--max-operations", type=int, default=default_limits.max_operations, help="arithmetic operations per run, 0 for no limit")
+    serve_parser.add_argument("--max-bits", type=int, default=default_limits.max_bits, help="bit length of integers, 0 for no limit")
+    serve_parser.add_argument("--max-output", type=int, default=default_limits.max_output, help="output bytes per run, 0 for no limit")
+    serve_parser.add_argument("--cache", default=None, help="SQLite file where the results of runs are kept and reused")
+    serve_parser.add_argument("--cache-size", type=int, default=256, help="maximum size of the result cache in MB")
+
+    for method in METHODS:
+        method_parser = commands.add_parser(method, parents=[common], help=f"{method} a file with the daemon")
+        method_parser.add_argument("file", help=".iol file")
+        method_parser.add_argument("--timeout", type=float, default=None, help="seconds the request may take")
+        if method == "run":
+            method_parser.add_argument("--input", action="append", default=[], help="input for the next BEG, in order")
+    commands.add_parser("ping", parents=[common], help="show the state of the daemon")
+
+    args = parser.parse_args()
+    if args.method == "serve":
+        serve(args)
+    else:
+        sys.exit(send(args))
@@ -0,0 +1,176 @@
+#########################################################################
+# Program description:                                                  #
+#   Syntax highlighting for the code editor. Words are classified with  #
+#   the lexical analyzer, and only the lines on screen and the lines    #
+#   that were edited are scanned again, so the cost of highlighting     #
+#   does not grow with the size of the file.                            #
+#########################################################################
+
+import tkinter as tk
+
+from iol import LexicalAnalyzer
+
+
+# tag of each kind of word and its color
+TAG_COLORS = {
+    "hl_keyword": "#0000c0",
+    "hl_type": "#7a1fa2",
+    "hl_operator": "#a05a00",
+    "hl_int_lit": "#00796b",
+    "hl_ident": "#000000",
+    "hl_err_lex": "#d00000",
+}
+TYPE_KEYWORDS = ("INT", "STR")
+OPERATOR_KEYWORDS = ("ADD", "SUB", "MULT", "DIV", "MOD")
+
+# classified words kept before the cache is emptied
+MAX_CACHED_WORDS = 4096
+
+
+class Highlighter:
+    """
+    A class that highlights the words of a tk.Text with the tokens of the IOL language.
+
+    Changes only mark the lines they touched and schedule a refresh, so many
+    changes in a row are highlighted once. A refresh scans the lines on screen
+    and the edited lines, removes their old tags and adds the new ones with one
+    call per tag.
+
+    Attributes
+    ----------
+    text : tk.Text
+        The code editor
+    lex : LexicalAnalyzer
+        Classifies the words
+    tags : dict[str, str]
+        Tag of each token name
+    word_tags : dict[str, str]
+        Cache of the tag of each word seen
+    dirty_lines : set[int]
+        Lines edited since the last refresh
+    delay : int
+        Milliseconds to wait for more changes before a refresh
+
+    Methods
+    ----------
+    schedule(line)
+        Asks for a refresh, marking a line as edited
+    refresh()
+        Highlights the lines on screen and the edited lines
+    highlight_lines(first, last)
+        Highlights a range of lines
+    """
+    def __init__(self, text: tk.Text, lex: LexicalAnalyzer, delay: int = 30) -> None:
+        self.text = text
+        self.lex = lex
+        self.delay = delay
+        self.word_tags = dict()
+        self.dirty_lines = set()
+        self.pending = None
+        self.tags = {
+            "INT_LIT": "hl_int_lit",
+            "IDENT": "hl_ident",
+            "ERR_LEX": "hl_err_lex",
+        }
+        for keyword in lex.keywords:
+            if keyword in TYPE_KEYWORDS:
+                self.tags[keyword] = "hl_type"
+            elif keyword in OPERATOR_KEYWORDS:
+                self.tags[keyword] = "hl_operator"
+            else:
+                self.tags[keyword] = "hl_keyword"
+
+        for tag, color in TAG_COLORS.items():
+            self.text.tag_configure(tag, foreground=color)
+        self.text.tag_configure("hl_err_lex", underline=True)
+        # lower than any other tag so they keep showing over the highlighting
+        for tag in TAG_COLORS:
+            self.text.tag_lower(tag)
+
+        self.text.bind("<<Modified>>", self.on_modified, add=True)
+
+    """
+    Called by Tk when the text changes
+    """
+    def on_modified(self, event) -> None:
+
+        # resetting the flag sends this event again
+        if not self.text.edit_modified():
+            return
+        # the flag must be reset or Tk does not send the event again
+        self.text.edit_modified(False)
+        self.schedule(int(self.text.index(tk.INSERT).split(".")[0]))
+
+    """
+    Asks for a refresh once the changes stop for a moment
+
+    Parameters
+    ----------
+    line : int | None
+        A line that was edited, None if only the view changed
+    """
+    def schedule(self, line: int | None = None) -> None:
+
+        if line is not None:
+            self.dirty_lines.add(line)
+        if self.pending is not None:
+            self.text.after_cancel(self.pending)
+        self.pending = self.text.after(self.delay, self.refresh)
+
+    """
+    Highlights the lines on screen and the lines edited since the last refresh
+    """
+    def refresh(self) -> None:
+
+        self.pending = None
+        first = int(self.text.index("@0,0").split(".")[0])
+        last = int(self.text.index(f"@0,{self.text.winfo_height()}").split(".")[0])
+        self.highlight_lines(first, last)
+
+        # edits are nearly always on screen, the rest are highlighted one by one
+        line_count = int(self.text.index("end-1c").split(".")[0])
+        for line in self.dirty_lines:
+            if (line < first or line > last) and line <= line_count:
+                self.highlight_lines(line, line)
+        self.dirty_lines.clear()
+
+    """
+    Highlights a range of lines
+
+    Parameters
+    ----------
+    first : int
+        First line, starting from 1
+    last : int
+        Last line, included
+    """
+    def highlight_lines(self, first: int, last: int) -> None:
+
+        start = f"{first}.0"
+        end = f"{last}.0 lineend"
+        lines = self.text.get(start, end).split("\n")
+
+        word_tags = self.word_tags
+        ranges = {tag: list() for tag in TAG_COLORS}
+        for line_num, line in enumerate(lines, first):
+            column = 0
+            for word in line.split():
+                column = line.find(word, column)
+                tag = word_tags.get(word)
+                if tag is None:
+                    if len(word_tags) >= MAX_CACHED_WORDS:
+                        word_tags.clear()
+                    try:
+                        tag = self.tags[self.lex.word_to_token(word)[0]]
+                    except ValueError:
+                        # numeric characters that int() does not accept
+                        tag = "hl_err_lex"
+                    word_tags[word] = tag
+                ranges[tag].append(f"{line_num}.{column}")
+                column += len(word)
+                ranges[tag].append(f"{line_num}.{column}")
+
+        for tag, indices in ranges.items():
+            self.text.tag_remove(tag, start, end)
+            if indices:
+                self.text.tag_add(tag, *indices)
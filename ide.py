@@ -0,0 +1,658 @@
+#########################################################################
+# Authors:                                                              #
+#   Galang, Kent Michael                                                #
+#   Masayon, Christian Ace                                              #
+#   Poledo, Clent Japhet                                                #
+#########################################################################
+# Program description:                                                  #
+#   The IDE for the IOL programming language                            #
+#########################################################################
+
+import tkinter as tk
+from tkinter import filedialog, ttk, simpledialog
+
+from iol import LexicalAnalyzer, SyntaxAnalyzer, CodeGenerator, LivenessAnalyzer, Interpreter, IOLRuntimeError, compile_source
+from profiler import ProfilingInterpreter
+from background_writer import BackgroundWriter
+from highlighter import Highlighter
+from stall_watchdog import StallWatchdog
+
+
+class App:
+    """
+    A class for the UI of the app
+    """
+    def __init__(self, master):
+        self.master = master
+        self.master.title("PyDE")
+        self.master.geometry("1400x600")
+
+        self.file_path = None
+        self.sym_tbl = dict()
+        self.lex = LexicalAnalyzer()
+        self.syn = SyntaxAnalyzer()
+        self.codegen = CodeGenerator()
+        self.liveness = LivenessAnalyzer()
+        self.program = list()
+        self.tokenized_code = ""
+        # files are saved on another thread, results are shown by poll_saves()
+        self.writer = BackgroundWriter()
+        self.polling_saves = False
+        self.master.protocol("WM_DELETE_WINDOW", self.on_close)
+        # for profiling executions
+        self.profiling = tk.BooleanVar(value=False)
+        self.profile = None
+        # from barely used to the slowest line
+        self.heat_colors = ("#fff5f0", "#fee0d2", "#fcbba1", "#fc9272", "#fb6a4a", "#ef3b2c")
+        # for finding the callbacks that freeze the IDE
+        self.tracing_stalls = tk.BooleanVar(value=False)
+        self.watchdog = StallWatchdog(self.master)
+
+        # Create the main frame
+        self.main_frame = tk.Frame(self.master)
+        self.main_frame.pack(fill=tk.BOTH, expand=True)
+
+        # Create the input frame (top left)
+        self.input_frame = tk.Frame(self.main_frame)
+        self.input_frame.pack(side="left", fill=tk.BOTH, expand=True)
+
+        # Create the Table of Variables frame (right side)
+        self.variables_frame = tk.Frame(self.main_frame)
+        self.variables_frame.pack(side="right", fill=tk.BOTH, expand=True)
+
+        # Create a frame for input_text and line_numbers
+        self.editor_frame = tk.Frame(self.input_frame)
+        self.editor_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+
+        # Label for Code Editor
+        self.editor_label = tk.Label(
+            self.editor_frame,
+            text="Code Editor",
+            anchor="w",
+            font=("Arial", 10, "bold"),
+        )
+        self.editor_label.pack(side="top", fill="x")
+
+        # Create the scrollbar for input_text
+        self.input_scrollbar = tk.Scrollbar(self.editor_frame, command=self.on_scroll)
+        # self.input_scrollbar = tk.Scrollbar(self.editor_frame)
+        self.input_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.line_numbers = tk.Text(
+            self.editor_frame, width=4, padx=5, highlightthickness=0
+        )
+        self.line_numbers.pack(side=tk.LEFT, fill=tk.Y)
+        self.line_numbers.insert("1.0", "1")
+        self.line_numbers.config(
+            yscrollcommand=self.on_line_num_scroll, state=tk.DISABLED
+        )
+
+        self.input_text = tk.Text(self.editor_frame, undo=True)
+        self.input_text.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        self.input_text.config(yscrollcommand=self.on_text_scroll)
+
+        for level, color in enumerate(self.heat_colors):
+            self.input_text.tag_configure(f"heat{level}", background=color)
+        self.highlighter = Highlighter(self.input_text, self.lex)
+
+        self.input_text.bind("<KeyPress>", self.on_key_press)
+        # self.input_text.bind('<KeyRelease>', self.on_key_release)
+        self.input_text.focus_set()
+        # self.input_text.bind('<Key>', self.on_text_configure)
+        # self.input_text.bind('<MouseWheel>', self.on_mousewheel)
+
+        self.update_line_numbers()
+
+        # Label for Console
+        self.console_label = tk.Label(
+            self.input_frame, text="Console", anchor="w", font=("Arial", 10, "bold")
+        )
+        self.console_label.pack(side="top", fill="x")
+
+        self.output_text = tk.Text(self.input_frame, height=15, state=tk.DISABLED)
+        self.output_text.pack(
+            side=tk.LEFT, fill=tk.BOTH, expand=True
+        )  # Change side to 'left'
+
+        # Create the scrollbar for output_text (console) on the right
+        self.console_scrollbar = tk.Scrollbar(
+            self.input_frame, command=self.output_text.yview
+        )
+        self.console_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.output_text.config(yscrollcommand=self.console_scrollbar.set)
+
+        # Label for Table of Variables
+        self.variables_label = tk.Label(
+            self.variables_frame,
+            text="Table of Variables",
+            anchor="w",
+            font=("Arial", 10, "bold"),
+        )
+        self.variables_label.pack(side="top", fill="x")
+
+        # self.variables_text = tk.Text(self.variables_frame, state=tk.DISABLED)
+        default_headers = ["Variable", "Type"]
+        self.variables_text = ttk.Treeview(
+            self.variables_frame,
+            columns=default_headers,
+            show="headings",
+            selectmode="browse",
+        )
+        self.variables_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        # Insert the default column headers
+        for header in default_headers:
+            self.variables_text.heading(header, text=header)
+            self.variables_text.column(header, minwidth=50, stretch=True, anchor="center")
+        self.variables_text.pack(side="left", fill=tk.BOTH, expand=True)
+
+        self.variables_scrollbar = tk.Scrollbar(
+            self.variables_frame, command=self.variables_text.yview
+        )
+        self.variables_scrollbar.pack(side="right", fill=tk.Y)
+
+        self.variables_text.config(yscrollcommand=self.variables_scrollbar.set)
+
+        self.menu = tk.Menu(self.master)
+        self.master.config(menu=self.menu)
+
+        # For file menu
+        self.file_menu = tk.Menu(self.menu, tearoff=False)
+        self.menu.add_cascade(label="File", menu=self.file_menu)
+        self.file_menu.add_command(label="New File (Ctrl+N)", command=self.new_file)
+        self.file_menu.add_command(label="Open File (Ctrl+O)", command=self.open_file)
+        self.file_menu.add_command(label="Save File (Ctrl+S)", command=self.save_file)
+        self.file_menu.add_command(
+            label="Save File As (Ctrl+Shift+S)", command=self.save_file_as
+        )
+        self.file_menu.add_separator()
+        self.file_menu.add_command(label="Exit (Ctrl+Q)", command=self.on_close)
+
+        # For compile code, show tokenized code, and execute code buttons
+        self.menu.add_command(label="(F1) Compile Code", command=self.compile_code)
+        self.menu.add_command(
+            label="(F2) Show Tokenized Code",
+            command=self.show_tokenized_code,
+            state=tk.DISABLED,
+        )
+        self.menu.add_command(
+            label="(F3) Execute Code", command=self.execute_code, state=tk.DISABLED
+        )
+
+        # For tools
+        self.tools_menu = tk.Menu(self.menu, tearoff=False)
+        self.menu.add_cascade(label="Tools", menu=self.tools_menu)
+        self.tools_menu.add_checkbutton(label="Profile Execution", variable=self.profiling)
+        self.tools_menu.add_command(
+            label="Export Profile Report", command=self.export_profile, state=tk.DISABLED
+        )
+        self.tools_menu.add_command(label="Clear Heatmap", command=self.clear_heatmap)
+        self.tools_menu.add_separator()
+        self.tools_menu.add_checkbutton(
+            label="Trace UI Stalls", variable=self.tracing_stalls, command=self.toggle_stall_tracing
+        )
+        self.tools_menu.add_command(label="Export Stall Report", command=self.export_stall_report)
+
+        # Configure row and column weights for resizing
+        self.main_frame.grid_rowconfigure(0, weight=1)
+        self.main_frame.grid_columnconfigure(0, weight=1)
+        self.input_frame.grid_rowconfigure(2, weight=1)
+        self.input_frame.grid_columnconfigure(1, weight=1)
+        self.variables_frame.grid_rowconfigure(1, weight=1)
+        self.variables_frame.grid_columnconfigure(1, weight=1)
+
+    """
+    Called when a key is pressed on the code editor
+    """
+    def on_key_press(self, event):
+
+        # v is for ctrl+v (paste)
+        if (
+            event.keysym == "Return"
+            or event.keysym == "BackSpace"
+            or event.keysym == "v"
+            or event.keysym == "V"
+        ):
+            self.update_line_numbers()
+
+    """
+    Called when a key is released on the code editor
+    """
+    def on_key_release(self, event):
+
+        # v is for ctrl+v (paste)
+        if (
+            event.keysym == "Return"
+            or event.keysym == "BackSpace"
+            or event.keysym == "v"
+            or event.keysym == "V"
+        ):
+            self.update_line_numbers()
+        elif event.keysym == "F1":
+            self.menu.invoke(2)
+        elif event.keysym == "F2":
+            self.menu.invoke(3)
+        elif event.keysym == "F3":
+            self.menu.invoke(4)
+        elif event.state == 4:  # keypress with Ctrl
+            if event.keysym == "n" or event.keysym == "N":
+                self.file_menu.invoke(0)
+            elif event.keysym == "o" or event.keysym == "O":
+                self.file_menu.invoke(1)
+            elif event.keysym == "s" or event.keysym == "S":
+                self.file_menu.invoke(2)
+            elif event.keysym == "q" or event.keysym == "Q":
+                self.file_menu.invoke(5)
+        elif event.state == 5:  # keypress with Ctrl and Shift
+            if event.keysym == "s" or event.keysym == "S":
+                self.file_menu.invoke(3)
+
+    """
+    Update the line numbers in the left side of the UI
+    """
+    def update_line_numbers(self):
+
+        line_count = int(self.input_text.index("end-1c").split(".")[0])
+        # line_numbers_text = '\n'.join(str(i) for i in range(1, int(line_count) + 1))
+        self.line_numbers.config(state=tk.NORMAL)
+        current_line_numbers = self.line_numbers.get("1.0", "end-1c").split("\n")
+        last_num = len(current_line_numbers)
+
+        diff = line_count - last_num
+        while diff != 0:
+            if diff > 0:
+                last_num += 1
+                self.line_numbers.insert(str(last_num) + ".0", "\n" + str(last_num))
+            else:
+                last_num -= 1
+                self.line_numbers.delete(
+                    str(last_num + 1) + ".0", str(last_num + 2) + ".0"
+                )
+            diff = line_count - last_num
+
+        # self.line_numbers.delete("1.0", tk.END)
+        # self.line_numbers.insert("1.0", line_numbers_text)
+        self.line_numbers.yview_moveto(self.input_text.yview()[0])
+        self.line_numbers.config(state=tk.DISABLED)
+
+    """
+    Called when a the code editor scrollbar is dragged
+    """
+    def on_scroll(self, *args):
+
+        self.input_text.yview_moveto(args[1])
+        self.line_numbers.yview_moveto(args[1])
+
+    """
+    Called when the main input text is scrolled
+    """
+    def on_text_scroll(self, *args):
+
+        self.input_scrollbar.set(args[0], args[1])
+        self.line_numbers.yview_moveto(args[0])
+        # lines that came into view need highlighting
+        self.highlighter.schedule()
+
+    """
+    Called when the line number text is scrolled
+    """
+    def on_line_num_scroll(self, *args):
+
+        self.input_scrollbar.set(args[0], args[1])
+        self.line_numbers.yview_moveto(self.input_text.yview()[0])
+        # self.input_text.yview_moveto(args[0])
+
+    # def on_mousewheel(self, event):
+    #     self.line_numbers.yview_moveto(self.input_text.yview()[0])
+
+    """
+    Called when user wants to create a new file
+    """
+    def new_file(self):
+
+        self.file_path = None
+        self.input_text.delete("1.0", tk.END)
+        self.update_line_numbers()
+        # disable show tokenized code and execute code button
+        self.menu.entryconfig(3, state=tk.DISABLED)
+        self.menu.entryconfig(4, state=tk.DISABLED)
+        for child in self.variables_text.get_children():
+            self.variables_text.delete(child)
+
+    """
+    Called when user wants to open a file
+    """
+    def open_file(self):
+
+        file_path = filedialog.askopenfilename(filetypes=[("IOL Files", "*.iol")])
+        if file_path:
+            self.file_path = file_path
+            with open(file_path, "r") as file:
+                content = file.read()
+                # if content.endswith('\n'):
+                #     content = content[:-1]
+                self.input_text.delete("1.0", tk.END)
+                self.input_text.insert(tk.END, content)
+            self.writer.remember(file_path, content)
+            self.update_line_numbers()
+            # disable show tokenized code and execute code button
+            self.menu.entryconfig(3, state=tk.DISABLED)
+            self.menu.entryconfig(4, state=tk.DISABLED)
+            for child in self.variables_text.get_children():
+                self.variables_text.delete(child)
+
+            self.output_text.configure(state=tk.NORMAL)
+            self.output_text.insert(tk.END, f"Opened {self.file_path}\n\n")
+            self.output_text.configure(state=tk.DISABLED)
+            self.output_text.yview_moveto(1)
+
+    """
+    Called when user wants to save an opened file
+    """
+    def save_file(self):
+
+        if self.file_path:
+            if not self.file_path.endswith(".iol"):
+                self.file_path += ".iol"
+            self.save_in_background(self.file_path, self.input_text.get("1.0", "end-1c"))
+            # disable show tokenized code and execute code button
+            self.menu.entryconfig(3, state=tk.DISABLED)
+            self.menu.entryconfig(4, state=tk.DISABLED)
+            for child in self.variables_text.get_children():
+                self.variables_text.delete(child)
+        else:
+            self.save_file_as()
+
+    """
+    Called when user wants to save a file as different file
+    """
+    def save_file_as(self):
+
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".iol", filetypes=[("IOL Files", "*.iol")]
+        )
+        if file_path:
+            if not file_path.endswith(".iol"):
+                file_path += ".iol"
+            self.file_path = file_path
+            self.save_in_background(self.file_path, self.input_text.get("1.0", "end-1c"))
+            # disable show tokenized code and execute code button
+            self.menu.entryconfig(3, state=tk.DISABLED)
+            self.menu.entryconfig(4, state=tk.DISABLED)
+            for child in self.variables_text.get_children():
+                self.variables_text.delete(child)
+
+    """
+    Schedules a file to be saved by the background writer
+    """
+    def save_in_background(self, path, text):
+
+        self.writer.save(path, text)
+        if not self.polling_saves:
+            self.polling_saves = True
+            self.master.after(50, self.poll_saves)
+
+    """
+    Shows the results of finished saves, polling until every save is done
+    """
+    def poll_saves(self):
+
+        results = self.writer.get_results()
+        if results:
+            self.output_text.configure(state=tk.NORMAL)
+            for path, written, error in results:
+                if error is not None:
+                    self.output_text.insert(tk.END, f"Could not save {path}: {error}\n\n")
+                # .tkn files are announced by compile_code()
+                elif not path.endswith(".iol"):
+                    continue
+                elif written:
+                    self.output_text.insert(tk.END, f"Saved to {path}\n\n")
+                else:
+                    self.output_text.insert(tk.END, f"No changes to save in {path}\n\n")
+            self.output_text.configure(state=tk.DISABLED)
+            self.output_text.yview_moveto(1)
+
+        if self.writer.busy() or not self.writer.results.empty():
+            self.master.after(50, self.poll_saves)
+        else:
+            self.polling_saves = False
+
+    """
+    Called when the window is closed, waits for the files being saved
+    """
+    def on_close(self):
+
+        self.watchdog.stop()
+        self.writer.close()
+        self.master.destroy()
+
+    """
+    Called when user wants to compile an IOL file
+    """
+    def compile_code(self):
+
+        self.save_file()
+        if self.file_path == None:
+            return
+        
+        self.clear_heatmap()
+
+        # compile the text in the editor, the saves run in the background meanwhile
+        source = self.input_text.get("1.0", tk.END)
+        compilation = compile_source(source, self.lex, self.syn, self.codegen)
+        self.sym_tbl = compilation.sym_tbl
+
+        ########## Lexical Analysis ##########
+
+        self.output_text.configure(state=tk.NORMAL)
+        self.output_text.insert(tk.END, f"Compiling {self.file_path}\n\n")
+        if not compilation.lexical_errors:
+            self.output_text.insert(
+                tk.END, "Lexical analysis completed without errors.\n"
+            )
+            self.output_text.yview_moveto(1)
+        else:
+            lex_errors = compilation.lexical_messages()
+            for message in lex_errors[:self.syn.max_errors]:
+                self.output_text.insert(tk.END, f"{message}\n")
+            if len(lex_errors) > self.syn.max_errors:
+                self.output_text.insert(
+                    tk.END, f"... and {len(lex_errors) - self.syn.max_errors} more.\n"
+                )
+            self.output_text.yview_moveto(1)
+            self.output_text.insert(tk.END, "Lexical analysis completed with error(s).\n")
+            self.output_text.yview_moveto(1)
+
+        # making .tkn file
+        tkn_file_path = self.file_path[:-3] + "tkn"
+        self.tokenized_code = compilation.tokenized_code
+        self.save_in_background(tkn_file_path, self.tokenized_code)
+        self.output_text.insert(
+            tk.END, f"\nTokenized version of the source code saved in {tkn_file_path}\n\n"
+        )
+        self.output_text.configure(state=tk.DISABLED)
+        self.output_text.yview_moveto(1)
+
+        # display proper outputs and enable show tokenized code button
+        # self.variables_text.configure(state=tk.NORMAL)
+        # self.variables_text.delete("1.0", tk.END)
+        for child in self.variables_text.get_children():
+            self.variables_text.delete(child)
+        for var in self.sym_tbl:
+            self.variables_text.insert("", "end", values=[var, self.sym_tbl[var][0]])
+        # self.variables_text.configure(state=tk.DISABLED)
+        self.menu.entryconfig(3, state=tk.NORMAL)
+
+        ########## Syntax Analysis ##########
+        self.output_text.configure(state=tk.NORMAL)
+        if compilation.syntax_errors:
+            for message in compilation.syntax_messages():
+                self.output_text.insert(tk.END, f"{message}\n")
+            self.output_text.insert(tk.END, "Syntax analysis completed with error(s).\n")
+            self.output_text.yview_moveto(1)
+        else:
+            self.output_text.insert(tk.END, "Syntax analysis completed without errors.\n")
+            self.output_text.yview_moveto(1)
+        if compilation.program is None:
+            # when there is error, disable the execute code button
+            self.menu.entryconfig(4, state=tk.DISABLED)
+        else:
+            # dead stores and unused variables are not executed nor listed
+            self.program, self.sym_tbl, warnings = self.liveness.optimize(compilation.program, self.sym_tbl)
+            for line_num, warning_message in warnings:
+                self.output_text.insert(
+                    tk.END, f"Warning at line {line_num}: {warning_message}\n"
+                )
+            for child in self.variables_text.get_children():
+                self.variables_text.delete(child)
+            for var in self.sym_tbl:
+                self.variables_text.insert("", "end", values=[var, self.sym_tbl[var][0]])
+            self.output_text.yview_moveto(1)
+            # when there is no error, enable the execute code button
+            self.menu.entryconfig(4, state=tk.NORMAL)
+        self.output_text.configure(state=tk.DISABLED)
+        
+
+    """
+    Called when user wants to show a tokenized IOL file (tkn file)
+    """
+    def show_tokenized_code(self):
+
+        top = tk.Toplevel(self.master)
+        label = tk.Label(top, text="Tokenized Code", font=("Arial", 10, "bold"))
+        label.pack(fill="x")
+        frame = tk.Frame(top)
+        frame.pack(expand=True, fill="both", padx=10, pady=10)
+        scroll = tk.Scrollbar(frame)
+        scroll.pack(side=tk.RIGHT, fill="y")
+        text = tk.Text(frame, yscrollcommand=scroll.set)
+        text.pack(expand=True, fill="both")
+        scroll.configure(command=text.yview)
+
+        # the .tkn file may still be being saved, show what was compiled
+        text_with_lines = self.tokenized_code.splitlines(keepends=True)
+        for i in range(len(text_with_lines)):
+            text.insert(
+                f"{i + 1}.0", f"{'{0: <3}'.format(i + 1)} | {text_with_lines[i]}"
+            )
+
+        text.configure(state=tk.DISABLED)
+
+    """
+    Called when user wants to execute a compiled IOL file
+    """
+    def execute_code(self):
+        # make the output text writable
+        self.output_text.configure(state=tk.NORMAL)
+        self.output_text.insert(tk.END, f"\nIOL Execution:\n\n")
+        self.output_text.yview_moveto(1)
+
+        if self.profiling.get():
+            interpreter = ProfilingInterpreter(self.read_input, self.write_output)
+        else:
+            interpreter = Interpreter(self.read_input, self.write_output)
+        try:
+            interpreter.run(self.program, self.sym_tbl)
+        except IOLRuntimeError as error:
+            self.output_text.insert(tk.END, f"\n\nProgram terminated with error: {error}\n\n")
+        else:
+            self.output_text.insert(tk.END, f"\n\nProgram terminated successfully...\n\n")
+
+        # finally, disable the console from user input
+        self.output_text.yview_moveto(1)
+        self.output_text.configure(state=tk.DISABLED)
+
+        if self.profiling.get():
+            self.show_heatmap(interpreter)
+
+    """
+    Called when the program being executed needs an input, returns None if cancelled
+    """
+    def read_input(self, var):
+
+        self.master.update()   # simpledialog goes behind root without this for some reason
+        user_input = simpledialog.askstring("Input", f"Input for {var}")
+        self.output_text.insert(tk.END, f"Input for {var}: {user_input}\n")
+        self.output_text.yview_moveto(1)
+        return user_input
+
+    """
+    Called when the program being executed prints something
+    """
+    def write_output(self, text):
+
+        self.output_text.insert(tk.END, text)
+        self.output_text.yview_moveto(1)
+
+    """
+    Colors the lines of the code editor by how long they took in the last profiled execution
+    """
+    def show_heatmap(self, interpreter):
+
+        self.clear_heatmap()
+        self.profile = interpreter
+        ranges = [list() for _ in self.heat_colors]
+        for line, level in interpreter.heat_levels(len(self.heat_colors)).items():
+            ranges[level].extend((f"{line}.0", f"{line}.0 lineend"))
+        # one call per level, a call per line is slow on long programs
+        for level, indexes in enumerate(ranges):
+            if indexes:
+                self.input_text.tag_add(f"heat{level}", *indexes)
+        self.tools_menu.entryconfig(1, state=tk.NORMAL)
+
+    """
+    Called when user wants to remove the heatmap from the code editor
+    """
+    def clear_heatmap(self):
+
+        for level in range(len(self.heat_colors)):
+            self.input_text.tag_remove(f"heat{level}", "1.0", tk.END)
+
+    """
+    Called when user wants to save the report of the last profiled execution
+    """
+    def export_profile(self):
+
+        if self.profile is None:
+            return
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".txt", filetypes=[("Text Files", "*.txt")]
+        )
+        if file_path:
+            with open(file_path, "w") as file:
+                file.write(f"Profile of {self.file_path}\n\n")
+                file.write(self.profile.report())
+
+            self.output_text.configure(state=tk.NORMAL)
+            self.output_text.insert(tk.END, f"Profile report saved to {file_path}\n\n")
+            self.output_text.configure(state=tk.DISABLED)
+            self.output_text.yview_moveto(1)
+
+    """
+    Starts or stops recording the callbacks that block the IDE
+    """
+    def toggle_stall_tracing(self):
+
+        if self.tracing_stalls.get():
+            self.watchdog.start()
+        else:
+            self.watchdog.stop()
+
+    """
+    Saves the stalls recorded so far, to attach to a bug report
+    """
+    def export_stall_report(self):
+
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".txt", filetypes=[("Text Files", "*.txt")]
+        )
+        if file_path:
+            with open(file_path, "w") as file:
+                file.write(self.watchdog.report())
+
+            self.output_text.configure(state=tk.NORMAL)
+            self.output_text.insert(tk.END, f"Stall report saved to {file_path}\n\n")
+            self.output_text.configure(state=tk.DISABLED)
+            self.output_text.yview_moveto(1)
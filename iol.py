@@ -0,0 +1,1533 @@
+#########################################################################
+# Authors:                                                              #
+#   Galang, Kent Michael                                                #
+#   Masayon, Christian Ace                                              #
+#   Poledo, Clent Japhet                                                #
+#########################################################################
+# Program description:                                                  #
+#   The compiler for the IOL programming language, without the IDE so   #
+#   it can be imported where tkinter is not available                   #
+#########################################################################
+
+import math
+import os
+import re
+import time
+from array import array
+from itertools import islice
+
+
+# str.splitlines() ends a line at any of these, "\r\n" counts once
+LINE_BREAKS = ("\n", "\r", "\x0b", "\x0c", "\x1c", "\x1d", "\x1e", "\x85", "\u2028", "\u2029")
+
+# below this many characters, starting processes costs more than tokenize_parallel() saves
+MIN_PARALLEL_CHARS = 1 << 20
+
+# analyzer of a tokenize_parallel() worker process, created by its first chunk
+chunk_lexer = None
+
+# bump this whenever the results of executing a program change (e.g. a new
+# error or a different output) so that stored results are not reused
+INTERPRETER_VERSION = 1
+
+
+class TokenStore:
+    """
+    A compact storage for the tokens of a source file.
+
+    Instead of one (TOKEN_NAME, VALUE) tuple per token, each field is kept in its
+    own array: a one byte code for the token name, the value, and the position
+    of the token in the source. Columns are not stored, they are computed from
+    the offset of the token and the offset of its line. Tokens are read through
+    a TokenView.
+
+    Attributes
+    ----------
+    kinds : tuple
+        Token names, the code of a token is its index in this tuple
+    codes : array
+        Token name code of each token
+    values : list
+        Value of each token
+    lines : array
+        Line of each token, starting at 1
+    offsets : array
+        Offset of each token in the source, starting at 0
+    line_starts : array
+        Offset of each line in the source, the first line is at index 0
+
+    Methods
+    ----------
+    append(kind, value, line, offset)
+        Adds a token at the end of the store, line_starts must already hold its line
+    """
+    kinds = (
+        "IOL",
+        "LOI",
+        "INT",
+        "STR",
+        "IS",
+        "INTO",
+        "BEG",
+        "PRINT",
+        "ADD",
+        "SUB",
+        "MULT",
+        "DIV",
+        "MOD",
+        "NEWLN",
+        "ERR_LEX",
+        "INT_LIT",
+        "IDENT",
+    )
+    kind_codes = {kind: code for code, kind in enumerate(kinds)}
+
+    def __init__(self) -> None:
+        self.codes = array("B")
+        self.values = list()
+        self.lines = array("I")
+        self.offsets = array("Q")
+        self.line_starts = array("Q")
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    """
+    Adds a token at the end of the store
+    """
+    def append(self, kind: str, value: str | int, line: int, offset: int) -> None:
+
+        self.codes.append(self.kind_codes[kind])
+        self.values.append(value)
+        self.lines.append(line)
+        self.offsets.append(offset)
+
+
+class TokenView:
+    """
+    A read-only sequence of tokens backed by a TokenStore, nothing is copied.
+
+    Indexing gives a (TOKEN_NAME, VALUE) tuple like the token lists used before,
+    slicing gives another TokenView. Positions are read with line(), column()
+    and offset().
+    """
+    __slots__ = ("store", "start", "stop")
+
+    def __init__(self, store: TokenStore, start: int = 0, stop: int | None = None) -> None:
+        self.store = store
+        self.start = start
+        self.stop = len(store) if stop is None else stop
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __getitem__(self, index: int | slice) -> "tuple | TokenView":
+        if type(index) == slice:
+            indices = range(self.start, self.stop)[index]
+            if indices.step != 1:
+                return tuple(self[i - self.start] for i in indices)
+            return TokenView(self.store, indices.start, max(indices.start, indices.stop))
+        if index < 0:
+            index += self.stop - self.start
+        if index < 0 or index >= self.stop - self.start:
+            raise IndexError("token index out of range")
+        index += self.start
+        return (TokenStore.kinds[self.store.codes[index]], self.store.values[index])
+
+    def __iter__(self):
+        if self.start == 0:
+            codes = islice(self.store.codes, self.stop)
+            values = islice(self.store.values, self.stop)
+        else:
+            # islice() would step over every token before start, copying only the slice is cheaper
+            codes = self.store.codes[self.start:self.stop]
+            values = self.store.values[self.start:self.stop]
+        return zip(map(TokenStore.kinds.__getitem__, codes), values)
+
+    def __repr__(self) -> str:
+        return f"TokenView({list(self)!r})"
+
+    """
+    Returns the token name of a token
+    """
+    def kind(self, index: int) -> str:
+
+        return TokenStore.kinds[self.store.codes[self.start + index]]
+
+    """
+    Returns the line of a token, starting at 1
+    """
+    def line(self, index: int) -> int:
+
+        return self.store.lines[self.start + index]
+
+    """
+    Returns the column of a token in its line, starting at 0
+    """
+    def column(self, index: int) -> int:
+
+        index += self.start
+        return self.store.offsets[index] - self.store.line_starts[self.store.lines[index] - 1]
+
+    """
+    Returns the offset of a token in the source, starting at 0
+    """
+    def offset(self, index: int) -> int:
+
+        return self.store.offsets[self.start + index]
+
+
+class LexicalAnalyzer:
+    """
+    A class that converts a source file into tokens for the IOL language.
+
+    Token list:
+        [KEYWORDS]
+        IOL, LOI, INT, STR, IS, INTO, IS, BEG, PRINT, ADD, SUB, MULT, DIV, MOD, NEWLN
+        [OTHER TOKENS]
+        ERR_LEX, INT_LIT, IDENT
+
+    INT_LIT => digit {digit}
+    digit => 0 | 1 | ... | 9
+
+    IDENT => letter {(letter | digit)}
+    letter => a | b | c | ... | z | A | B | ... | Z
+    digit => 0 | 1 | ... | 9
+
+    Attributes
+    ----------
+    keywords : tuple
+        A list of keywords used by the programming language
+    tokens : TokenStore
+        The tokens from last tokenize() call
+    errors : list
+        A list of errors from last tokenize() call
+    var_list : list
+        A list of variables from last tokenize() call
+
+    Methods
+    ----------
+    tokenize(string)
+        Converts a given string into a series of tokens and returns whether or not errors were encountered
+    tokenize_parallel(string, sym_tbl, workers)
+        Same as tokenize() but tokenizes chunks of a large string in several processes
+    tokenize_chunk(string, offset, line_base)
+        Tokenizes some lines of a string, leaving the symbol table to tokenize_parallel()
+    word_to_token(word)
+        Converts a word into a token
+    get_tokens()
+        Returns a view of the tokens from last tokenize()
+    get_tokenized_code(string)
+        Returns the tokenized version of the string given to last tokenize()
+    get_var_list()
+        Returns the list of variables from last tokenize()
+    get_errors()
+        Returns the list of errors from last tokenize()
+    """
+    def __init__(self) -> None:
+        self.keywords = (
+            "IOL",
+            "LOI",
+            "INT",
+            "STR",
+            "IS",
+            "INTO",
+            "IS",
+            "BEG",
+            "PRINT",
+            "ADD",
+            "SUB",
+            "MULT",
+            "DIV",
+            "MOD",
+            "NEWLN",
+        )
+        self.tokens = TokenStore()
+        self.errors = list()
+
+    """
+    Converts a given string into a series of tokens and returns whether or not errors were encountered
+
+    Parameters
+    ----------
+    string : str
+        An input string to tokenize
+
+    Returns
+    -------
+    bool
+        True if no errors encountered, False otherwise
+    """
+    def tokenize(self, string: str, sym_tbl: dict[str, list[str | int]]) -> bool:
+
+        # previous results stay valid for views already given out
+        tokens = self.tokens = TokenStore()
+        errors = self.errors = list()
+
+        # TokenStore.append() inlined, this loop runs for every word of the source
+        kind_codes = TokenStore.kind_codes
+        append_code = tokens.codes.append
+        append_value = tokens.values.append
+        append_line = tokens.lines.append
+        append_offset = tokens.offsets.append
+        append_line_start = tokens.line_starts.append
+        word_to_token = self.word_to_token
+        # most words are repeated all over a source, convert each only once and
+        # keep only one copy of its value
+        known_words = dict()
+
+        curr_line = 0
+        line_start = 0
+        last_kind = None
+        for line in string.splitlines(keepends=True):
+            curr_line += 1
+            append_line_start(line_start)
+            column = 0
+            for word in line.split():
+                # only whitespace is between the last word and this one
+                column = line.find(word, column)
+                token = known_words.get(word)
+                if token is None:
+                    token = known_words[word] = word_to_token(word)
+                kind, value = token
+                append_code(kind_codes[kind])
+                append_value(value)
+                append_line(curr_line)
+                append_offset(line_start + column)
+                if kind == "ERR_LEX":
+                    errors.append((value, curr_line, "unknown word", column))
+                elif kind == "IDENT":
+                    if (last_kind == "STR" or last_kind == "INT"):
+                        if value in sym_tbl:
+                            errors.append(
+                                (value, curr_line, "duplicate variable definition", column)
+                            )
+                        elif last_kind == "STR":
+                            sym_tbl[value] = [last_kind, ""]
+                        else:
+                            sym_tbl[value] = [last_kind, 0]
+                    else:
+                        if value not in sym_tbl:
+                            errors.append(
+                                (value, curr_line, "undefined variable", column)
+                            )
+                last_kind = kind
+                column += len(word)
+            line_start += len(line)
+
+        if len(self.errors) == 0:
+            return True
+        else:
+            return False
+
+    """
+    Same as tokenize() but splits a large string at line boundaries and tokenizes
+    the chunks in a process pool
+
+    Whether an identifier is a declaration depends on the token before it, and
+    whether a variable is defined depends on everything before it, so every
+    chunk is tokenized without a symbol table and reports its declarations and
+    the uses it could not resolve by itself. Those are then resolved chunk by
+    chunk in source order, which gives the same tokens, errors and symbol table
+    as tokenize().
+
+    Parameters
+    ----------
+    string : str
+        An input string to tokenize
+    sym_tbl : dict[str, list[str | int]]
+        The symbol table, filled like tokenize() does
+    workers : int | None
+        Number of processes, None for one per CPU
+    executor : concurrent.futures.Executor | None
+        A pool to use instead of starting one
+
+    Returns
+    -------
+    bool
+        True if no errors encountered, False otherwise
+    """
+    def tokenize_parallel(self, string: str, sym_tbl: dict[str, list[str | int]], workers: int | None = None, executor=None) -> bool:
+
+        workers = workers or os.cpu_count() or 1
+        if len(string) < MIN_PARALLEL_CHARS or workers == 1:
+            return self.tokenize(string, sym_tbl)
+
+        # a few chunks per worker so that one slow chunk does not hold up the rest
+        chunk_size = max(MIN_PARALLEL_CHARS // 4, len(string) // (workers * 4))
+        chunks = list()
+        start = 0
+        line_base = 0
+        while start < len(string):
+            end = string.find("\n", start + chunk_size)
+            end = len(string) if end == -1 else end + 1
+            chunks.append((string[start:end], start, line_base))
+            line_base += sum(string.count(line_break, start, end) for line_break in LINE_BREAKS)
+            line_base -= string.count("\r\n", start, end)
+            start = end
+
+        if executor is None:
+            # imported here, it loads multiprocessing and would double the time to import this module
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(tokenize_chunk, *zip(*chunks)))
+        else:
+            results = list(executor.map(tokenize_chunk, *zip(*chunks)))
+
+        tokens = self.tokens = TokenStore()
+        errors = self.errors = list()
+        last_kind = None
+        for chunk_tokens, chunk_errors, boundary, declarations, positions, unresolved, chunk_last_kind in results:
+            start = len(tokens)
+            tokens.codes.extend(chunk_tokens.codes)
+            tokens.values.extend(chunk_tokens.values)
+            tokens.lines.extend(chunk_tokens.lines)
+            tokens.offsets.extend(chunk_tokens.offsets)
+            tokens.line_starts.extend(chunk_tokens.line_starts)
+
+            # the first identifier of a chunk is a declaration if the last chunk ended with a type
+            if boundary is not None:
+                value, line, column = boundary
+                if last_kind == "STR" or last_kind == "INT":
+                    if value in sym_tbl:
+                        chunk_errors.append((0, (value, line, "duplicate variable definition", column)))
+                    else:
+                        sym_tbl[value] = [last_kind, "" if last_kind == "STR" else 0]
+                elif value not in sym_tbl:
+                    chunk_errors.append((0, (value, line, "undefined variable", column)))
+            # only earlier chunks can define these, finding their uses is only needed for errors
+            undefined = unresolved - sym_tbl.keys()
+            if undefined:
+                chunk_errors.extend(self.find_undefined(start, len(tokens), undefined, positions))
+            # set operations and update() keep this fast when a chunk declares many variables
+            for value in declarations.keys() & sym_tbl.keys():
+                index = positions[value]
+                chunk_errors.append((index, self.token_error(start + index, "duplicate variable definition")))
+                del declarations[value]
+            sym_tbl.update(declarations)
+
+            # every token has at most one error, sorting by token puts them in source order
+            chunk_errors.sort(key=lambda error: error[0])
+            errors.extend(error for index, error in chunk_errors)
+            if chunk_last_kind is not None:
+                last_kind = chunk_last_kind
+
+        return len(errors) == 0
+
+    """
+    Tokenizes some lines of a string for tokenize_parallel()
+
+    The symbol table is not used. Instead, the variables declared in these lines
+    and the variables used before their first declaration in these lines are
+    returned, and so is the first token if it is an identifier, since the token
+    before it is in another chunk. Only names and token indexes are returned for
+    them, the results are pickled to the parent process and a tuple per use
+    would cost more to send than tokenizing them.
+
+    Parameters
+    ----------
+    string : str
+        Whole lines of the input string
+    offset : int
+        Offset of the lines in the input string
+    line_base : int
+        Number of lines before these lines
+
+    Returns
+    -------
+    tuple
+        (tokens, errors, boundary, declarations, positions, unresolved, last_kind)
+        where errors are (token_index, error) of the errors found without the
+        symbol table, boundary is (value, line, column) of a leading identifier,
+        declarations is a symbol table of the variables declared in order,
+        positions maps them to the token index of their first declaration,
+        unresolved is the set of variables used before their declaration in
+        these lines, and last_kind is the token name of the last token
+    """
+    def tokenize_chunk(self, string: str, offset: int, line_base: int) -> tuple:
+
+        tokens = TokenStore()
+        errors = list()
+        boundary = None
+        declarations = dict()
+        positions = dict()
+        unresolved = set()
+
+        kind_codes = TokenStore.kind_codes
+        append_code = tokens.codes.append
+        append_value = tokens.values.append
+        append_line = tokens.lines.append
+        append_offset = tokens.offsets.append
+        append_line_start = tokens.line_starts.append
+        word_to_token = self.word_to_token
+        known_words = dict()
+
+        index = 0
+        curr_line = line_base
+        line_start = offset
+        last_kind = None
+        for line in string.splitlines(keepends=True):
+            curr_line += 1
+            append_line_start(line_start)
+            column = 0
+            for word in line.split():
+                column = line.find(word, column)
+                token = known_words.get(word)
+                if token is None:
+                    token = known_words[word] = word_to_token(word)
+                kind, value = token
+                append_code(kind_codes[kind])
+                append_value(value)
+                append_line(curr_line)
+                append_offset(line_start + column)
+                if kind == "ERR_LEX":
+                    errors.append((index, (value, curr_line, "unknown word", column)))
+                elif kind == "IDENT":
+                    if index == 0:
+                        boundary = (value, curr_line, column)
+                    elif (last_kind == "STR" or last_kind == "INT"):
+                        if value in declarations:
+                            errors.append(
+                                (index, (value, curr_line, "duplicate variable definition", column))
+                            )
+                        else:
+                            declarations[value] = [last_kind, "" if last_kind == "STR" else 0]
+                            positions[value] = index
+                    elif value not in declarations:
+                        unresolved.add(value)
+                last_kind = kind
+                column += len(word)
+                index += 1
+            line_start += len(line)
+
+        return tokens, errors, boundary, declarations, positions, unresolved, last_kind
+
+    """
+    Finds the uses of undefined variables in the tokens of a chunk, for
+    tokenize_parallel()
+
+    Parameters
+    ----------
+    start : int
+        Index of the first token of the chunk
+    end : int
+        Index after the last token of the chunk
+    names : set[str]
+        Variables that no earlier chunk defines
+    positions : dict[str, int]
+        Index in the chunk of the variables declared by the chunk
+
+    Returns
+    -------
+    list
+        The errors as (token_index, error), with indexes in the chunk
+    """
+    def find_undefined(self, start: int, end: int, names: set[str], positions: dict[str, int]) -> list:
+
+        codes = self.tokens.codes
+        values = self.tokens.values
+        ident = TokenStore.kind_codes["IDENT"]
+        types = (TokenStore.kind_codes["INT"], TokenStore.kind_codes["STR"])
+        errors = list()
+        # the first token is the boundary, tokenize_parallel() checks it
+        for index in range(start + 1, end):
+            value = values[index]
+            if (
+                codes[index] == ident
+                and value in names
+                and codes[index - 1] not in types
+                and index - start < positions.get(value, math.inf)
+            ):
+                errors.append((index - start, self.token_error(index, "undefined variable")))
+        return errors
+
+    """
+    Returns an error about a token, in the format of get_errors()
+
+    Parameters
+    ----------
+    index : int
+        Index of the token
+    definition : str
+        What is wrong with it
+
+    Returns
+    -------
+    tuple
+        (error_word, line_number, error_definition, column)
+    """
+    def token_error(self, index: int, definition: str) -> tuple:
+
+        tokens = self.tokens
+        line = tokens.lines[index]
+        return (tokens.values[index], line, definition, tokens.offsets[index] - tokens.line_starts[line - 1])
+
+    """
+    Converts a word into a token
+
+    Parameters
+    ---------
+    word : str
+        The word to convert into token
+
+    Returns
+    -------
+    tuple
+        A token in the format (TOKEN_NAME, VALUE)
+    """
+    def word_to_token(self, word: str) -> tuple:
+
+        # check if word is keyword
+        if word in self.keywords:
+            return (word, word)
+        # check if word is an int_lit or ident or err_lex
+        else:
+            # Logic:
+            # '' --numeric--> 'INT_LIT'
+            # '' --alphabet--> 'IDENT'
+            # '' --neither--> 'ERR_LEX'
+            # 'INT_LIT' --numeric--> 'INT_LIT'
+            # 'INT_LIT' --alphabet--> 'ERR_LEX'
+            # 'INT_LIT' --neither--> 'ERR_LEX'
+            # 'IDENT' --numeric--> 'IDENT'
+            # 'IDENT' --alphabet--> 'IDENT'
+            # 'IDENT' --neither--> 'ERR_LEX'
+            # 'ERR_LEX' --whatever--> 'ERR_LEX'
+            possible_token = ""
+            for letter in word:
+                if possible_token == "ERR_LEX":
+                    break
+
+                if letter.isnumeric():
+                    if possible_token == "" or possible_token == "INT_LIT":
+                        possible_token = "INT_LIT"
+                    elif possible_token == "IDENT":
+                        possible_token = "IDENT"
+                elif letter.isalpha():
+                    if possible_token == "" or possible_token == "IDENT":
+                        possible_token = "IDENT"
+                    elif possible_token == "INT_LIT":
+                        possible_token = "ERR_LEX"
+                else:
+                    possible_token = "ERR_LEX"
+
+            if possible_token == "INT_LIT":
+                word = int(word)
+            return (possible_token, word)
+
+    """
+    Returns a view of the tokens from last tokenize()
+
+    The view does not copy the tokens and cannot change them, a later tokenize()
+    stores its tokens elsewhere so the view stays valid.
+
+    Returns
+    -------
+    TokenView
+        A sequence of tokens [(token_name, value), ...] with their positions
+    """
+    def get_tokens(self) -> TokenView:
+
+        return TokenView(self.tokens)
+
+    """
+    Returns the tokenized version of the string given to last tokenize()
+
+    Every word of the string is replaced by its token name while whitespace is kept
+    as is, which is the content of a .tkn file.
+
+    Parameters
+    ----------
+    string : str
+        The same string given to last tokenize()
+
+    Returns
+    -------
+    str
+        The tokenized version of the string
+    """
+    def get_tokenized_code(self, string: str) -> str:
+
+        text = re.split("(\\s+)", string)
+        kinds = TokenStore.kinds
+        codes = self.tokens.codes
+        current_token = 0
+        for i in range(len(text)):
+            if text[i].isspace() or text[i] == "":
+                continue
+            else:
+                text[i] = kinds[codes[current_token]]
+                current_token += 1
+
+        return "".join(text)
+
+    """
+    Returns the list of errors from last tokenize()
+
+    Returns
+    -------
+    list
+        A list of errors [(error_word, line_number, error_definition, column), ...]
+    """
+    def get_errors(self) -> list:
+
+        return self.errors
+
+
+"""
+Tokenizes a chunk in a tokenize_parallel() worker process, see LexicalAnalyzer.tokenize_chunk()
+"""
+def tokenize_chunk(string: str, offset: int, line_base: int) -> tuple:
+
+    global chunk_lexer
+    if chunk_lexer is None:
+        chunk_lexer = LexicalAnalyzer()
+    return chunk_lexer.tokenize_chunk(string, offset, line_base)
+
+class ErrorMessage:
+    """An error message that is only formatted when it is displayed.
+
+    Tuple arguments are joined with spaces, so the words of a statement can be
+    kept without building the string.
+
+    Attributes:
+        template (str): a str.format() template
+        args (tuple): arguments of the template
+    """
+    __slots__ = ("template", "args")
+
+    def __init__(self, template: str, *args) -> None:
+        self.template = template
+        self.args = args
+
+    def __str__(self) -> str:
+        return self.template.format(*(" ".join(arg) if type(arg) == tuple else arg for arg in self.args))
+
+    def __repr__(self) -> str:
+        return repr(str(self))
+
+class SyntaxAnalyzer:
+    """A class that analyzes the syntax of the generated tokens.
+    This also implements a static semantic analysis.
+
+    Attributes:
+        prod (list[list[str]]): production rule for the language
+        ptbl (dict[str, list[str, int]]): parse table for the language
+        terminal_index (dict[str, int]): column of each terminal in the parse table
+        expected (dict[str, str]): terminals accepted by each nonterminal, for error messages
+        sync_tokens (tuple[str]): tokens where parsing resumes after an error
+        max_errors (int): number of errors after which analysis stops
+
+    Methods:
+        check_input(path): checks a .tkn file for proper grammar
+        check_lines(lines): checks the lines of a tokenized code for proper grammar
+    """
+    def __init__(self, max_errors: int = 100) -> None:
+        self.prod = [
+            ["s", "IOL stmts LOI"],
+            ["stmts", "stmt stmts"],
+            ["stmts", "e"],
+            ["stmt", "var"],
+            ["stmt", "asn"],
+            ["stmt", "expr"],
+            ["stmt", "PRINT expr"],
+            ["stmt", "NEWLN"],
+            ["var", "INT IDENT varend"],
+            ["var", "STR IDENT varend"],
+            ["varend", "IS INT_LIT"],
+            ["varend", "e"],
+            ["asn", "INTO IDENT IS expr"],
+            ["asn", "BEG IDENT"],
+            ["expr", "ADD expr expr"],
+            ["expr", "SUB expr expr"],
+            ["expr", "MULT expr expr"],
+            ["expr", "DIV expr expr"],
+            ["expr", "MOD expr expr"],
+            ["expr", "IDENT"],
+            ["expr", "INT_LIT"],
+        ]
+        self.ptbl = {
+            "terminals": [
+                "IOL",
+                "INT",
+                "STR",
+                "INTO",
+                "BEG",
+                "PRINT",
+                "NEWLN",
+                "LOI",
+                "IS",
+                "ADD",
+                "SUB",
+                "MULT",
+                "DIV",
+                "MOD",
+                "IDENT",
+                "INT_LIT",
+            ],
+            "s": [1, "", "", "", "", "", "", "", "", "", "", "", "", "", "", ""],
+            "stmts": ["", 2, 2, 2, 2, 2, 2, 3, "", 2, 2, 2, 2, 2, 2, 2],
+            "stmt": ["", 4, 4, 5, 5, 7, 8, "", "", 6, 6, 6, 6, 6, 6, 6],
+            "var": ["", 9, 10, "", "", "", "", "", "", "", "", "", "", "", "", ""],
+            "varend": ["", 12, 12, 12, 12, 12, 12, 12, 11, 12, 12, 12, 12, 12, 12, 12],
+            "asn": ["", "", "", 13, 14, "", "", "", "", "", "", "", "", "", "", ""],
+            "expr": ["", "", "", "", "", "", "", "", "", 15, 16, 17, 18, 19, 20, 21],
+        }
+        self.terminal_index = {terminal: i for i, terminal in enumerate(self.ptbl["terminals"])}
+        self.expected = {
+            nonterminal: "','".join(
+                terminal for terminal, dest in zip(self.ptbl["terminals"], row) if dest != ""
+            )
+            for nonterminal, row in self.ptbl.items()
+            if nonterminal != "terminals"
+        }
+        # tokens that can only appear at the start of a statement (or the end of the program)
+        self.sync_tokens = ("INT", "STR", "INTO", "BEG", "PRINT", "NEWLN", "LOI")
+        self.max_errors = max_errors
+
+    """Returns the process in trying to check if an input string is a valid word according to the grammar
+
+    Args:
+        input_path (str): .tkn file path
+        sym_tbl (dict[str, list[str | int]]): symbol table
+        tokens (list[tuple[str, str]]): token stream
+
+    Returns:
+        list[tuple[int, ErrorMessage] | None]: error details [(line_number, error_details), ...]
+    """
+    def check_input(self, input_path: str, sym_tbl: dict[str, list[str | int]], tokens: list[tuple[str, str]]) -> list[tuple[int, ErrorMessage] | None]:
+        
+        with open(input_path, "r") as file:
+            input = file.readlines()
+        return self.check_lines(input, sym_tbl, tokens)
+
+    """Same as check_input() but takes the lines of the tokenized code instead of a .tkn file
+
+    Args:
+        input (list[str]): lines of the tokenized code
+        sym_tbl (dict[str, list[str | int]]): symbol table
+        tokens (list[tuple[str, str]]): token stream
+
+    Returns:
+        list[tuple[int, ErrorMessage] | None]: error details [(line_number, error_details), ...]
+    """
+    def check_lines(self, input: list[str], sym_tbl: dict[str, list[str | int]], tokens: list[tuple[str, str]]) -> list[tuple[int, ErrorMessage] | None]:
+
+        prod = self.prod
+        ptbl = self.ptbl
+        terminal_index = self.terminal_index
+        list_errors = list()
+
+        # add the first nonterminal and $ to the stack, its top is the last item
+        stack = ["$", prod[0][0]]
+        input_buffer = input[0].split() if len(input) != 0 else []
+        next_line = 1
+        line_num = 1
+        # add $ to the end of the input buffer
+        input_buffer.append("$")
+        # words of the line are read with a cursor, popping them from the front would be quadratic
+        next_word = 0
+
+        # vars related to error
+        error_recovering = False
+        loi_end_found = False
+
+        # vars related to type checking
+        # tokens are read with a cursor, the given tokens are never changed
+        next_token = 0
+        def peek_token():
+            return tokens[next_token] if next_token < len(tokens) else ("$", "$")
+        declared_vars = list()
+        statement = list()
+        semantic_case = None
+        last_ident_token = None
+
+        while next_line < len(input) or len(input_buffer) != next_word:
+            if len(input_buffer) - next_word == 1 and next_line < len(input):
+                new_line = input[next_line].split()
+                next_line += 1
+                line_num += 1
+                # check if popped line is empty
+                while len(new_line) == 0 and next_line < len(input):
+                    new_line = input[next_line].split()
+                    next_line += 1
+                    line_num += 1
+                input_buffer = new_line + ["$"]
+                next_word = 0
+
+            # if input buffer still only has $, stop
+            if len(input_buffer) - next_word == 1:
+                break
+
+            # stop once the error budget is used up
+            if len(list_errors) >= self.max_errors:
+                list_errors.append((line_num, ErrorMessage("Too many errors, stopped after {} errors", len(list_errors))))
+                return list_errors
+
+            if error_recovering:
+                # nothing after 'LOI' can be recovered, skip the rest of the input
+                if loi_end_found:
+                    break
+                # skip tokens until one that starts a statement
+                if input_buffer[next_word] not in self.sync_tokens:
+                    next_word += 1
+                    next_token += 1
+                    continue
+                stack = ["$", "LOI", "stmts", "stmt"]
+                error_recovering = False
+                continue
+            
+            curr_stack = stack.pop()
+            curr_input = input_buffer[next_word]
+
+            # for displaying semantic analysis errors
+            if curr_stack == "stmt":
+                statement.clear()
+                semantic_case = None
+                last_ident_token = None
+            if curr_input == "LOI" and not loi_end_found:
+                loi_end_found = True
+                if curr_stack == "stmt":
+                    curr_stack = "LOI"
+                    stack = ["$"]
+
+            if curr_input == curr_stack:
+                # for matching case, just remove the terminal in both columns
+                next_word += 1
+                popped_token = peek_token()
+                next_token += 1
+
+                # for each correct case, check for possible type errors
+                match popped_token[0]:
+                    case "INT" | "STR":
+                        semantic_case = "DECLARE"
+                        statement.append(popped_token[1])
+                    case "INTO":
+                        semantic_case = "INTO"
+                        statement.append(popped_token[1])
+                    case "ADD" | "SUB" | "MULT" | "DIV" | "MOD":
+                        statement.append(popped_token[1])
+                        if semantic_case == "IS":
+                            if last_ident_token[1] in declared_vars and sym_tbl[last_ident_token[1]][0] != "INT":
+                                current_error = ErrorMessage("Type error '{}'. '{}' is of type STR", tuple(statement), last_ident_token[1])
+                                list_errors.append((line_num, current_error))
+                        semantic_case = "MATH"
+                    case "IS":
+                        semantic_case = "IS"
+                        statement.append(popped_token[1])
+                    case "IDENT":
+                        statement.append(popped_token[1])
+                        if semantic_case == "DECLARE":
+                            if popped_token[1] in declared_vars:
+                                current_error = ErrorMessage("Duplicate variable declaration '{}' in '{}'", popped_token[1], tuple(statement))
+                                list_errors.append((line_num, current_error)) 
+                            else:
+                                declared_vars.append(popped_token[1])
+                        elif popped_token[1] not in declared_vars:
+                            current_error = ErrorMessage("Undefined variable '{}' in '{}'", popped_token[1], tuple(statement))
+                            list_errors.append((line_num, current_error))
+                        elif semantic_case == "IS":
+                            if sym_tbl[last_ident_token[1]][0] != sym_tbl[popped_token[1]][0]:
+                                current_error = ErrorMessage("Type error '{}'. '{}' is of type {}", tuple(statement), last_ident_token[1], sym_tbl[last_ident_token[1]][0])
+                                list_errors.append((line_num, current_error))
+                        elif semantic_case == "MATH":
+                            if sym_tbl[popped_token[1]][0] != "INT":
+                                current_error = ErrorMessage("Type error '{}'. '{}' is of type {}", tuple(statement), popped_token[1], sym_tbl[popped_token[1]][0])
+                                list_errors.append((line_num, current_error))
+                        last_ident_token = popped_token
+                    case "INT_LIT":
+                        statement.append(str(popped_token[1]))
+                        if semantic_case == "IS":
+                            if last_ident_token[1] in declared_vars and sym_tbl[last_ident_token[1]][0] != "INT":
+                                current_error = ErrorMessage("Type error '{}'. '{}' is of type STR", tuple(statement), last_ident_token[1])
+                                list_errors.append((line_num, current_error))
+                    case _:
+                        statement.append(popped_token[1])
+                    
+            else:
+                # on errors, the offending token is left in the input and skipped while recovering
+                if curr_stack not in ptbl:
+                    # raise Exception(
+                    #     f"{line_num} Error: '{curr_stack}' is not a nonterminal in parse table"
+                    # )
+                    if curr_stack == "$":
+                        current_error = ErrorMessage("({}) Expected no tokens after 'LOI' but found '{}'", peek_token()[1], curr_input)
+                        loi_end_found = True
+                    else:
+                        current_error = ErrorMessage("({}) Expected '{}' token, got '{}'", peek_token()[1], curr_stack, curr_input)
+                    
+                    list_errors.append((line_num, current_error))
+                    error_recovering = True
+                    continue
+                if curr_input not in terminal_index:
+                    # raise Exception(
+                    #     f"{line_num} Error: '{curr_input}' is not a terminal in parse table"
+                    # )
+                    if curr_input == "$":
+                        current_error = ErrorMessage("({}) Expected a 'LOI' at the end of file", peek_token()[1])
+                    else:
+                        current_error = ErrorMessage("({}) Expected '{}' token, got '{}'", peek_token()[1], self.expected[curr_stack], curr_input)
+                    
+                    list_errors.append((line_num, current_error))
+                    error_recovering = True
+                    continue
+                # query the production to use from the parse table
+                dest_line_num = ptbl[curr_stack][terminal_index[curr_input]]
+                if dest_line_num == "":
+                    # raise Exception(f"{line_num} Error: Resulted in a crash")
+                    current_error = ErrorMessage("({}) Expected '{}' token, got '{}'", peek_token()[1], self.expected[curr_stack], curr_input)
+                    
+                    list_errors.append((line_num, current_error))
+                    error_recovering = True
+                    continue
+                prod_to_replace = prod[dest_line_num - 1]
+                # if production is not epsilon, add those to stack
+                if prod_to_replace[1] != "e":
+                    stack.extend(reversed(prod_to_replace[1].split()))
+            # save the current step
+            error_recovering = False
+        
+        if not loi_end_found:
+            current_error = ErrorMessage("Expected a 'LOI' at the end of file")
+            list_errors.append((line_num, current_error))
+        return list_errors
+
+
+class CodeGenerator:
+    """A class that converts a token stream without errors into statements to execute.
+
+    IOL has no control flow, so a program is a list of statements executed in order.
+    Each statement is a tuple (operation, variable, expression, line):
+        ("INT" | "STR", variable, expression | None, line)  declaration, with its initial value if any
+        ("INTO", variable, expression, line)                assignment
+        ("BEG", variable, None, line)                       input
+        ("PRINT", None, expression, line)                   output
+        ("NEWLN", None, None, line)                         new line
+    where line is the line of the first token of the statement, or None if the
+    tokens have no positions.
+    Expressions are kept as tuples of tokens in prefix order, e.g. MULT num 2 is
+    (("MULT", "MULT"), ("IDENT", "num"), ("INT_LIT", 2)), and can be evaluated
+    by going through them in reverse with a stack. Expressions used as statements
+    have no effect and are dropped.
+
+    Attributes:
+        operators (tuple[str]): tokens that take two expressions
+
+    Methods:
+        generate(tokens): returns the statements of a token stream
+    """
+    def __init__(self) -> None:
+        self.operators = ("ADD", "SUB", "MULT", "DIV", "MOD")
+
+    """Returns the statements of a token stream that passed the syntax analysis
+
+    Args:
+        tokens (TokenView | list[tuple[str, str]]): token stream
+
+    Returns:
+        list[tuple[str, str | None, tuple | None, int | None]]: statements [(operation, variable, expression, line), ...]
+    """
+    def generate(self, tokens: TokenView | list[tuple[str, str]]) -> list[tuple[str, str | None, tuple | None, int | None]]:
+
+        statements = list()
+        has_lines = type(tokens) == TokenView
+        i = 0
+        while i < len(tokens):
+            kind = tokens[i][0]
+            line = tokens.line(i) if has_lines else None
+            match kind:
+                case "INT" | "STR":
+                    if i + 2 < len(tokens) and tokens[i + 2][0] == "IS":
+                        statements.append((kind, tokens[i + 1][1], (tokens[i + 3],), line))
+                        i += 4
+                    else:
+                        statements.append((kind, tokens[i + 1][1], None, line))
+                        i += 2
+                case "INTO":
+                    expr, end = self.read_expr(tokens, i + 3)
+                    statements.append(("INTO", tokens[i + 1][1], expr, line))
+                    i = end
+                case "BEG":
+                    statements.append(("BEG", tokens[i + 1][1], None, line))
+                    i += 2
+                case "PRINT":
+                    expr, end = self.read_expr(tokens, i + 1)
+                    statements.append(("PRINT", None, expr, line))
+                    i = end
+                case "NEWLN":
+                    statements.append(("NEWLN", None, None, line))
+                    i += 1
+                case "ADD" | "SUB" | "MULT" | "DIV" | "MOD" | "IDENT" | "INT_LIT":
+                    i = self.read_expr(tokens, i)[1]
+                case _:
+                    # IOL and LOI
+                    i += 1
+        return statements
+
+    """Reads the expression starting at a given token
+
+    Args:
+        tokens (list[tuple[str, str]]): token stream
+        start (int): index of the first token of the expression
+
+    Returns:
+        tuple[tuple, int]: the expression and the index of the token after it
+    """
+    def read_expr(self, tokens: list[tuple[str, str]], start: int) -> tuple[tuple, int]:
+
+        # each operator needs two more expressions, each operand completes one
+        needed = 1
+        end = start
+        while needed != 0:
+            if tokens[end][0] in self.operators:
+                needed += 1
+            else:
+                needed -= 1
+            end += 1
+        return tuple(tokens[start:end]), end
+
+
+class Compilation:
+    """The result of compile_source().
+
+    Attributes:
+        sym_tbl (dict[str, list[str | int]]): the symbol table
+        tokens (TokenView): the token stream
+        tokenized_code (str): the content of the .tkn file
+        lexical_errors (list[tuple]): errors from LexicalAnalyzer.get_errors()
+        syntax_errors (list[tuple[int, ErrorMessage]]): errors from SyntaxAnalyzer.check_lines()
+        program (list[tuple] | None): statements from CodeGenerator.generate(), None if there are errors
+
+    Methods:
+        lexical_messages(): returns the lexical errors as messages for the user
+        syntax_messages(): returns the syntax errors as messages for the user
+        diagnostics(): returns every error as a message for the user
+    """
+    __slots__ = ("sym_tbl", "tokens", "tokenized_code", "lexical_errors", "syntax_errors", "program")
+
+    def __init__(self, sym_tbl: dict, tokens: TokenView, tokenized_code: str, lexical_errors: list, syntax_errors: list) -> None:
+        self.sym_tbl = sym_tbl
+        self.tokens = tokens
+        self.tokenized_code = tokenized_code
+        self.lexical_errors = lexical_errors
+        self.syntax_errors = syntax_errors
+        self.program = None
+
+    def lexical_messages(self) -> list[str]:
+        return [f"{error[2].capitalize()} {error[0]} found in line {error[1]}." for error in self.lexical_errors]
+
+    def syntax_messages(self) -> list[str]:
+        return [f"Error at line {line_num}: {error_message}" for line_num, error_message in self.syntax_errors]
+
+    def diagnostics(self) -> list[str]:
+        return self.lexical_messages() + self.syntax_messages()
+
+
+"""Runs the lexical and syntax analysis of a source, and generates its program if it has no errors
+
+Tools keep their analyzers between sources, pass them to reuse them.
+
+Args:
+    source (str): the source code
+    lex (LexicalAnalyzer | None): the lexical analyzer, a new one if None
+    syn (SyntaxAnalyzer | None): the syntax analyzer, a new one if None
+    codegen (CodeGenerator | None): the code generator, a new one if None
+
+Returns:
+    Compilation: the symbol table, tokens, errors and program of the source
+"""
+def compile_source(source: str, lex: LexicalAnalyzer | None = None, syn: SyntaxAnalyzer | None = None, codegen: CodeGenerator | None = None) -> Compilation:
+
+    lex = LexicalAnalyzer() if lex is None else lex
+    syn = SyntaxAnalyzer() if syn is None else syn
+    sym_tbl = dict()
+    lex.tokenize(source, sym_tbl)
+    tokens = lex.get_tokens()
+    tokenized_code = lex.get_tokenized_code(source)
+    syntax_errors = syn.check_lines(tokenized_code.splitlines(), sym_tbl, tokens)
+    compilation = Compilation(sym_tbl, tokens, tokenized_code, lex.get_errors(), syntax_errors)
+    # only programs without errors can be executed
+    if not compilation.lexical_errors and not syntax_errors:
+        compilation.program = (CodeGenerator() if codegen is None else codegen).generate(tokens)
+    return compilation
+
+
+class ExecutionLimits:
+    """The resources one execution of a program may use, None means no limit.
+
+    Attributes:
+        max_operations (int | None): arithmetic operations
+        max_bits (int | None): bit length of any integer, from operations or inputs
+        max_output (int | None): bytes written by PRINT and NEWLN, in UTF-8
+        max_seconds (float | None): wall time, without the time spent waiting for input
+    """
+    __slots__ = ("max_operations", "max_bits", "max_output", "max_seconds")
+
+    def __init__(
+        self,
+        max_operations: int | None = 10_000_000,
+        max_bits: int | None = 1_000_000,
+        max_output: int | None = 10_000_000,
+        max_seconds: float | None = 60.0,
+    ) -> None:
+        self.max_operations = max_operations
+        self.max_bits = max_bits
+        self.max_output = max_output
+        self.max_seconds = max_seconds
+
+
+class LivenessAnalyzer:
+    """A class that removes the statements and variables that cannot change what a program does.
+
+    A backward pass over the statements computes which variables are live, i.e.
+    read by a later statement, after each one. Assignments and initial values
+    of declarations that are dead, because the variable is overwritten or never
+    read afterwards, are removed, as long as evaluating them cannot fail under
+    the limits the program runs with: an expression with DIV or MOD may divide
+    by zero, ADD, SUB and MULT may exceed max_bits, and when the program has
+    more operations than max_operations, removing any of them would let it go
+    further than it does. Such expressions are kept. Variables that are not
+    used by any statement left are removed with their declaration. BEG and
+    PRINT are always kept, since they read input and write output. The time
+    limit is not considered, removing work can only make a program faster.
+    Every removal is reported as a warning.
+
+    Attributes:
+        limits (ExecutionLimits): the limits the programs are executed with
+        operators (tuple[str]): the arithmetic operators
+        divisions (tuple[str]): operators that fail when their second operand is zero
+
+    Methods:
+        optimize(program, sym_tbl, live_out): returns the program and symbol table without dead code, and the warnings
+        can_remove(expr): returns whether an expression cannot fail
+    """
+    def __init__(self, limits: ExecutionLimits | None = None) -> None:
+        self.limits = ExecutionLimits() if limits is None else limits
+        self.operators = ("ADD", "SUB", "MULT", "DIV", "MOD")
+        self.divisions = ("DIV", "MOD")
+        # set by optimize(), whether the operation limit may stop the program
+        self.operations_limited = False
+
+    """Removes dead stores and unused variables from a program
+
+    Args:
+        program (list[tuple]): statements from CodeGenerator.generate()
+        sym_tbl (dict[str, list[str | int]]): the symbol table, it is not changed
+        live_out (Iterable[str]): variables whose final values are used after the program
+
+    Returns:
+        tuple[list[tuple], dict[str, list[str | int]], list[tuple[int, ErrorMessage]]]: the statements
+        left, the symbol table of the variables left and the warnings [(line_number, warning_details), ...]
+    """
+    def optimize(self, program: list[tuple], sym_tbl: dict[str, list[str | int]], live_out=()) -> tuple[list[tuple], dict[str, list[str | int]], list[tuple[int, ErrorMessage]]]:
+
+        # programs have no loops, every operation in them is done once unless an error stops them first
+        max_operations = self.limits.max_operations
+        operations = 0
+        for operation, var, expr, line in program:
+            if operation == "INTO" or operation == "PRINT":
+                operations += sum(1 for kind, value in expr if kind in self.operators)
+        self.operations_limited = max_operations is not None and operations > max_operations
+
+        # (line, template, variable) of the values that are never read
+        dead_stores = list()
+        live = set(live_out)
+        used = set(live_out)
+        kept = list()
+        for statement in reversed(program):
+            operation, var, expr, line = statement
+            match operation:
+                case "INT" | "STR":
+                    if expr is not None and var not in live:
+                        # the default value is never read either
+                        dead_stores.append((line, "Initial value of '{}' is never used", var))
+                        statement = (operation, var, None, line)
+                    live.discard(var)
+                case "INTO":
+                    if var not in live:
+                        dead_stores.append((line, "Value assigned to '{}' is never used", var))
+                        if self.can_remove(expr):
+                            continue
+                    live.discard(var)
+                    reads = [value for kind, value in expr if kind == "IDENT"]
+                    live.update(reads)
+                    used.update(reads)
+                    used.add(var)
+                case "BEG":
+                    live.discard(var)
+                    used.add(var)
+                case "PRINT":
+                    reads = [value for kind, value in expr if kind == "IDENT"]
+                    live.update(reads)
+                    used.update(reads)
+            kept.append(statement)
+        kept.reverse()
+
+        # variables that are never used get one warning, for their declaration
+        warnings = [(line, ErrorMessage(template, var)) for line, template, var in reversed(dead_stores) if var in used]
+        statements = list()
+        for statement in kept:
+            operation, var, expr, line = statement
+            if (operation == "INT" or operation == "STR") and var not in used:
+                warnings.append((line, ErrorMessage("Variable '{}' is never used", var)))
+            else:
+                statements.append(statement)
+        sym_tbl = {var: sym_tbl[var] for var in sym_tbl if var in used}
+
+        warnings.sort(key=lambda warning: warning[0] or 0)
+        return statements, sym_tbl, warnings
+
+    """Returns whether an expression can be left unevaluated, i.e. it cannot fail
+
+    Args:
+        expr (tuple): tokens of the expression in prefix order
+
+    Returns:
+        bool: False if the expression divides by something that may be zero, may
+        produce an integer over max_bits, or its operations may reach max_operations
+    """
+    def can_remove(self, expr: tuple) -> bool:
+
+        if self.operations_limited and any(kind in self.operators for kind, value in expr):
+            return False
+        max_bits = math.inf if self.limits.max_bits is None else self.limits.max_bits
+        # read backwards like Interpreter.evaluate(), keeping whether each operand is a nonzero
+        # literal and the most bits it can have, variables can have any value
+        stack = list()
+        for kind, value in reversed(expr):
+            if kind == "INT_LIT":
+                stack.append((value != 0, value.bit_length()))
+            elif kind == "IDENT":
+                stack.append((False, math.inf))
+            else:
+                left_bits = stack.pop()[1]
+                divisor_nonzero, right_bits = stack.pop()
+                if kind in self.divisions:
+                    if not divisor_nonzero:
+                        return False
+                    # neither makes the integers larger
+                    bits = left_bits if kind == "DIV" else right_bits
+                else:
+                    bits = left_bits + right_bits if kind == "MULT" else max(left_bits, right_bits) + 1
+                    if bits > max_bits:
+                        return False
+                stack.append((False, bits))
+        return True
+
+
+class IOLRuntimeError(Exception):
+    """An error that terminates the execution of a program, the message is shown to the user"""
+
+
+class IOLTimeoutError(IOLRuntimeError):
+    """An IOLRuntimeError for the time limit, the only one that depends on more than the program and its inputs"""
+
+
+class Interpreter:
+    """A class that executes the statements from CodeGenerator.generate().
+
+    Input and output go through the functions given to the constructor, so the
+    same interpreter runs programs in the IDE and in tools without a UI. Every
+    run is bounded by an ExecutionLimits. To keep the checks cheap, operations
+    only count down a budget and compare the size of their result; the clock
+    and the operation limit are checked when the budget runs out, every
+    CHECK_INTERVAL operations, and the clock before every statement.
+
+    Attributes:
+        read_input (Callable[[str], str | None]): returns the input for a variable, None if cancelled
+        write (Callable[[str], None]): shows the output of the program
+        limits (ExecutionLimits): the limits of every run
+        variables (dict[str, str | int]): value of each variable during the last run()
+        types (dict[str, str]): type of each variable during the last run()
+        operations (int): arithmetic operations done in the last run()
+        output_size (int): bytes written in the last run()
+
+    Methods:
+        run(program, sym_tbl): executes a program and returns the final values of its variables
+        execute(statement): executes one statement
+        evaluate(expr): returns the value of an expression
+        apply(op, num1, num2): returns the result of an arithmetic operation
+        output(text): writes the output of the program
+        check_operations(): checks the operation and time limits when the budget runs out
+    """
+    CHECK_INTERVAL = 1024
+
+    def __init__(self, read_input, write, limits: ExecutionLimits | None = None) -> None:
+        self.read_input = read_input
+        self.write = write
+        self.limits = ExecutionLimits() if limits is None else limits
+        self.variables = dict()
+        self.types = dict()
+        self.operations = 0
+        self.output_size = 0
+        self.deadline = math.inf
+        # operations left before the next check_operations(), out of budget_size
+        self.budget = self.budget_size = 0
+
+    """Executes a program
+
+    Args:
+        program (list[tuple]): statements from CodeGenerator.generate()
+        sym_tbl (dict[str, list[str | int]]): the symbol table, it is not changed
+
+    Raises:
+        IOLRuntimeError: when the program terminates with an error or exceeds a limit
+
+    Returns:
+        dict[str, str | int]: the final value of each variable
+    """
+    def run(self, program: list[tuple], sym_tbl: dict[str, list[str | int]]) -> dict[str, str | int]:
+
+        limits = self.limits
+        # no limit is an infinite one, so the checks need no None test
+        self.max_operations = math.inf if limits.max_operations is None else limits.max_operations
+        self.max_bits = math.inf if limits.max_bits is None else limits.max_bits
+        self.max_output = math.inf if limits.max_output is None else limits.max_output
+        self.deadline = math.inf if limits.max_seconds is None else time.monotonic() + limits.max_seconds
+        self.operations = 0
+        self.output_size = 0
+        self.budget = self.budget_size = min(self.CHECK_INTERVAL, self.max_operations + 1)
+
+        self.variables = {var: sym_tbl[var][1] for var in sym_tbl}
+        self.types = {var: sym_tbl[var][0] for var in sym_tbl}
+        try:
+            for statement in program:
+                self.execute(statement)
+        finally:
+            # count the operations since the last check
+            self.operations += self.budget_size - self.budget
+            self.budget_size = self.budget
+        return self.variables
+
+    """Executes one statement
+
+    Args:
+        statement (tuple): (operation, variable, expression, line)
+    """
+    def execute(self, statement: tuple) -> None:
+
+        if time.monotonic() > self.deadline:
+            raise IOLTimeoutError(f"Time limit exceeded ({self.limits.max_seconds:g} seconds).")
+
+        operation, var, expr, line = statement
+        match operation:
+            case "INT" | "STR" | "INTO":
+                if expr is not None:
+                    self.variables[var] = self.evaluate(expr)
+            case "BEG":
+                start = time.monotonic()
+                user_input = self.read_input(var)
+                # waiting for the user does not count as running
+                self.deadline += time.monotonic() - start
+                if user_input == None:
+                    raise IOLRuntimeError("User cancelled the input operation.")
+                elif self.types[var] == "INT":
+                    # type mismatch
+                    if not (user_input.isdigit() and user_input.isascii()):
+                        raise IOLRuntimeError(f"{var} expected an INT, got STR instead.")
+                    if len(user_input) > self.max_bits:
+                        raise IOLRuntimeError(f"Integer too large (over {self.limits.max_bits} bits).")
+                    try:
+                        value = int(user_input)
+                    except ValueError:
+                        # int() refuses more digits than sys.get_int_max_str_digits()
+                        raise IOLRuntimeError(f"Integer input for {var} is too long.") from None
+                    if value.bit_length() > self.max_bits:
+                        raise IOLRuntimeError(f"Integer too large (over {self.limits.max_bits} bits).")
+                    self.variables[var] = value
+                else:
+                    self.variables[var] = user_input
+            case "PRINT":
+                value = self.evaluate(expr)
+                try:
+                    self.output(f"{value}")
+                except ValueError:
+                    # and formatting refuses to write that many
+                    raise IOLRuntimeError("Integer too large to print.") from None
+            case "NEWLN":
+                self.output("\n")
+
+    """Writes the output of the program, unless it goes over the output limit
+
+    Args:
+        text (str): what to write
+    """
+    def output(self, text: str) -> None:
+
+        self.output_size += len(text) if text.isascii() else len(text.encode("utf-8", "surrogatepass"))
+        if self.output_size > self.max_output:
+            raise IOLRuntimeError(f"Output limit exceeded ({self.limits.max_output} bytes).")
+        self.write(text)
+
+    """Counts the operations done since the last check and checks the operation and time limits
+    """
+    def check_operations(self) -> None:
+
+        self.operations += self.budget_size - self.budget
+        self.budget_size = self.budget
+        if self.operations > self.max_operations:
+            raise IOLRuntimeError(f"Operation limit exceeded ({self.limits.max_operations} operations).")
+        if time.monotonic() > self.deadline:
+            raise IOLTimeoutError(f"Time limit exceeded ({self.limits.max_seconds:g} seconds).")
+        self.budget = self.budget_size = min(self.CHECK_INTERVAL, self.max_operations + 1 - self.operations)
+
+    """Returns the value of an expression
+
+    Args:
+        expr (tuple): tokens of the expression in prefix order
+
+    Returns:
+        str | int: the value of the expression
+    """
+    def evaluate(self, expr: tuple) -> str | int:
+
+        # prefix order read backwards is postfix order
+        stack = list()
+        for kind, value in reversed(expr):
+            if kind == "INT_LIT":
+                stack.append(value)
+            elif kind == "IDENT":
+                stack.append(self.variables[value])
+            else:
+                num1 = stack.pop()
+                num2 = stack.pop()
+                stack.append(self.apply(kind, num1, num2))
+        return stack.pop()
+
+    """Returns the result of an arithmetic operation
+
+    Args:
+        op (str): ADD, SUB, MULT, DIV or MOD
+        num1 (int): left operand
+        num2 (int): right operand
+
+    Raises:
+        IOLRuntimeError: on division by zero or when a limit is exceeded
+
+    Returns:
+        int: the result
+    """
+    def apply(self, op: str, num1: int, num2: int) -> int:
+
+        self.budget -= 1
+        if self.budget == 0:
+            self.check_operations()
+
+        match op:
+            case "ADD":
+                result = num1 + num2
+            case "SUB":
+                result = num1 - num2
+            case "MULT":
+                # a product has at least this many bits, refuse it before spending time on it
+                if num1.bit_length() + num2.bit_length() - 1 > self.max_bits:
+                    raise IOLRuntimeError(f"Integer too large (over {self.limits.max_bits} bits).")
+                result = num1 * num2
+            case "DIV" | "MOD":
+                if num2 == 0:
+                    raise IOLRuntimeError("Division by zero.")
+                # using // operator removes decimal points, neither can grow the integers
+                return num1 // num2 if op == "DIV" else num1 % num2
+        if result.bit_length() > self.max_bits:
+            raise IOLRuntimeError(f"Integer too large (over {self.limits.max_bits} bits).")
+        return result
@@ -0,0 +1,605 @@
+#########################################################################
+# Program description:                                                  #
+#   A Language Server Protocol (LSP) server for the IOL programming     #
+#   language. It talks JSON-RPC over stdin/stdout so that any editor    #
+#   with an LSP client can show IOL diagnostics, hovers and go-to-      #
+#   declaration.                                                        #
+#                                                                       #
+#   Usage: python lsp_server.py                                         #
+#########################################################################
+
+import hashlib
+import json
+import os
+import queue
+import re
+import sys
+import threading
+import traceback
+from bisect import bisect_right
+
+from iol import LexicalAnalyzer, SyntaxAnalyzer, CodeGenerator, LivenessAnalyzer, compile_source
+
+
+# LSP constants used by this server
+TEXT_DOCUMENT_SYNC_INCREMENTAL = 2
+SEVERITY_ERROR = 1
+SEVERITY_WARNING = 2
+
+# JSON-RPC error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+SERVER_NOT_INITIALIZED = -32002
+
+# a word as the lexical analyzer sees it
+WORD = re.compile("\\S+")
+# characters that take two UTF-16 code units
+ASTRAL = re.compile("[\\U00010000-\\U0010FFFF]")
+# line breaks as the LSP specification defines them
+LINE_BREAK = re.compile("\\r\\n|\\r|\\n")
+
+# seconds without messages before changed documents are analyzed
+ANALYSIS_DELAY = 0.1
+
+# how many analysis results are kept for documents that were closed or edited
+RESULT_CACHE_SIZE = 32
+
+
+class Analysis:
+    """
+    The result of analyzing one version of a document.
+
+    Attributes
+    ----------
+    sym_tbl : dict
+        The symbol table built by the lexical analyzer
+    words : dict[int, list[tuple[int, int, tuple]]]
+        Words of each line (0-based) as [(start_column, end_column, token), ...]
+    declarations : dict[str, tuple[int, int, int]]
+        Where each variable was declared as (line, start_column, end_column)
+    diagnostics : list[dict]
+        LSP diagnostics for the document
+    """
+    def __init__(self) -> None:
+        self.sym_tbl = dict()
+        self.words = dict()
+        self.declarations = dict()
+        self.diagnostics = list()
+
+    """
+    Returns the word found at the given position
+
+    Parameters
+    ----------
+    line : int
+        0-based line number
+    column : int
+        0-based column
+
+    Returns
+    -------
+    tuple | None
+        (start_column, end_column, token) or None if there is no word there
+    """
+    def word_at(self, line: int, column: int) -> tuple | None:
+
+        for word in self.words.get(line, ()):
+            if word[0] <= column <= word[1]:
+                return word
+        return None
+
+
+class Document:
+    """
+    A text document opened by the client.
+
+    Attributes
+    ----------
+    uri : str
+        The document URI
+    version : int
+        The last version sent by the client
+    text : str
+        The current content of the document
+    line_starts : list[int]
+        Offset of the first character of each line in text
+    astral : bool
+        Whether text may have characters that take two UTF-16 code units
+    analysis : Analysis | None
+        The analysis of the current text, None if the text changed since
+    """
+    def __init__(self, uri: str, version: int, text: str) -> None:
+        self.uri = uri
+        self.version = version
+        self.analysis = None
+        self.set_text(text)
+
+    """
+    Replaces the whole content of the document
+    """
+    def set_text(self, text: str) -> None:
+
+        self.text = text
+        self.line_starts = [0] + [m.end() for m in LINE_BREAK.finditer(text)]
+        # in most sources a character is one UTF-16 code unit and positions need no conversion
+        self.astral = ASTRAL.search(text) is not None
+        self.analysis = None
+
+    """
+    Replaces text[start:end], only scanning the changed lines for line breaks
+    """
+    def replace(self, start: int, end: int, new_text: str) -> None:
+
+        line_starts = self.line_starts
+        # the lines around the change are scanned again too, a \r before start or
+        # a \n at end may now be part of a \r\n break
+        first = bisect_right(line_starts, max(start - 1, 0))
+        last = bisect_right(line_starts, end)
+        scan_end = line_starts[last] if last < len(line_starts) else len(self.text)
+        delta = len(new_text) - (end - start)
+        self.text = self.text[:start] + new_text + self.text[end:]
+        scanned = [m.end() for m in LINE_BREAK.finditer(self.text, line_starts[first - 1], scan_end + delta)]
+        line_starts[first:] = scanned + [offset + delta for offset in line_starts[last + 1:]]
+        self.astral = self.astral or ASTRAL.search(new_text) is not None
+        self.analysis = None
+
+    """
+    Converts an LSP position (line, UTF-16 character) into an offset in text
+    """
+    def offset_at(self, position: dict) -> int:
+
+        line = position["line"]
+        if line >= len(self.line_starts):
+            return len(self.text)
+        start = self.line_starts[line]
+        end = self.line_end(line)
+        offset = start
+        units = position["character"]
+        if not self.astral:
+            return min(start + units, end)
+        while units > 0 and offset < end:
+            units -= 2 if ord(self.text[offset]) > 0xFFFF else 1
+            offset += 1
+        return offset
+
+    """
+    Converts an offset in text into an LSP position (line, UTF-16 character)
+    """
+    def position_at(self, offset: int) -> tuple[int, int]:
+
+        line = bisect_right(self.line_starts, offset) - 1
+        start = self.line_starts[line]
+        if not self.astral:
+            return line, offset - start
+        return line, offset - start + len(ASTRAL.findall(self.text, start, offset))
+
+    """
+    Returns the offset of the end of a line, before its line break
+    """
+    def line_end(self, line: int) -> int:
+
+        if line + 1 >= len(self.line_starts):
+            return len(self.text)
+        end = self.line_starts[line + 1] - 1
+        return end - 1 if self.text.startswith("\r\n", end - 1) else end
+
+    """
+    Applies a list of content changes sent through textDocument/didChange
+    """
+    def apply_changes(self, changes: list[dict]) -> None:
+
+        for change in changes:
+            if "range" not in change:
+                self.set_text(change["text"])
+                continue
+            start = self.offset_at(change["range"]["start"])
+            end = self.offset_at(change["range"]["end"])
+            self.replace(start, end, change["text"])
+
+
+class LanguageServer:
+    """
+    A Language Server for IOL backed by LexicalAnalyzer and SyntaxAnalyzer.
+
+    The analyzers are created once and reused for every request. Each document
+    is analyzed at most once per version and results are also cached by content
+    so that reopening or undoing to a previous content does not analyze again.
+    Messages are read on another thread, and opened or changed documents are
+    only analyzed once no message came for ANALYSIS_DELAY seconds, so typing
+    in a large document does not analyze it for every keystroke.
+
+    Attributes
+    ----------
+    documents : dict[str, Document]
+        The open documents by URI
+    results : dict[str, Analysis]
+        Recent analysis results by content hash
+    messages : queue.Queue
+        Messages read and not handled yet
+    stale : dict[str, Document]
+        Open documents whose diagnostics were not sent since they changed
+    lex : LexicalAnalyzer
+        The lexical analyzer used for all documents
+    syn : SyntaxAnalyzer
+        The syntax analyzer used for all documents
+    codegen : CodeGenerator
+        Generates the statements of documents without errors
+    liveness : LivenessAnalyzer
+        Finds dead stores and unused variables, reported as warnings
+    """
+    def __init__(self, input_stream, output_stream) -> None:
+        self.input_stream = input_stream
+        self.output_stream = output_stream
+        self.documents = dict()
+        self.results = dict()
+        self.messages = queue.Queue()
+        self.stale = dict()
+        self.lex = LexicalAnalyzer()
+        self.syn = SyntaxAnalyzer()
+        self.codegen = CodeGenerator()
+        self.liveness = LivenessAnalyzer()
+        self.initialized = False
+        self.shutdown_requested = False
+        self.handlers = {
+            "initialize": self.on_initialize,
+            "initialized": self.on_initialized,
+            "shutdown": self.on_shutdown,
+            "textDocument/didOpen": self.on_did_open,
+            "textDocument/didChange": self.on_did_change,
+            "textDocument/didClose": self.on_did_close,
+            "textDocument/hover": self.on_hover,
+            "textDocument/declaration": self.on_declaration,
+            "textDocument/definition": self.on_declaration,
+        }
+
+    """
+    Reads messages until the client sends exit or closes the stream
+
+    Returns
+    -------
+    int
+        The exit code of the server
+    """
+    def serve(self) -> int:
+
+        threading.Thread(target=self.read_messages, name="lsp-reader", daemon=True).start()
+        while True:
+            try:
+                message = self.messages.get(timeout=ANALYSIS_DELAY if self.stale else None)
+            except queue.Empty:
+                # no more changes for now, publish one document and look for messages again
+                document = self.stale.pop(next(iter(self.stale)))
+                try:
+                    self.publish_diagnostics(document)
+                except Exception:
+                    print(f"Analysis of {document.uri} failed:", file=sys.stderr)
+                    traceback.print_exc(file=sys.stderr)
+                continue
+            if isinstance(message, ValueError):
+                # not UTF-8 or not JSON
+                self.send({"jsonrpc": "2.0", "id": None, "error": {"code": PARSE_ERROR, "message": f"Parse error: {message}"}})
+                continue
+            if message is not None and type(message) != dict:
+                self.send({"jsonrpc": "2.0", "id": None, "error": {"code": INVALID_REQUEST, "message": "Invalid request"}})
+                continue
+            if message is None or message.get("method") == "exit":
+                return 0 if self.shutdown_requested else 1
+            self.handle(message)
+
+    """
+    Runs on the reader thread, queues the messages read until the end of the
+    stream, then None
+    """
+    def read_messages(self) -> None:
+
+        while True:
+            try:
+                message = self.read_message()
+            except ValueError as error:
+                message = error
+            self.messages.put(message)
+            if message is None:
+                return
+
+    """
+    Reads one JSON-RPC message, returns None at the end of the stream
+    """
+    def read_message(self) -> dict | None:
+
+        content_length = None
+        while True:
+            header = self.input_stream.readline()
+            if header == b"":
+                return None
+            header = header.strip()
+            if header == b"":
+                break
+            name, _, value = header.partition(b":")
+            if name.strip().lower() == b"content-length":
+                content_length = int(value.strip())
+        if content_length is None:
+            return None
+        return json.loads(self.input_stream.read(content_length).decode("utf-8"))
+
+    """
+    Writes one JSON-RPC message
+    """
+    def send(self, message: dict) -> None:
+
+        body = json.dumps(message, separators=(",", ":")).encode("utf-8")
+        self.output_stream.write(f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body)
+        self.output_stream.flush()
+
+    """
+    Dispatches a request or notification to its handler and sends the response
+    """
+    def handle(self, message: dict) -> None:
+
+        method = message.get("method")
+        is_request = "id" in message
+        if method is None:
+            # a response to something we never send, ignore it
+            return
+
+        handler = self.handlers.get(method)
+        if handler is None:
+            if is_request:
+                self.send({"jsonrpc": "2.0", "id": message["id"], "error": {"code": METHOD_NOT_FOUND, "message": f"Unknown method {method}"}})
+            return
+        if not self.initialized and method != "initialize":
+            if is_request:
+                self.send({"jsonrpc": "2.0", "id": message["id"], "error": {"code": SERVER_NOT_INITIALIZED, "message": "Server not initialized"}})
+            return
+
+        # a bad message or a bug must not stop the server, only fail that message
+        try:
+            result = handler(message.get("params") or {})
+        except Exception as error:
+            # missing or mistyped fields in params
+            code = INVALID_PARAMS if isinstance(error, (KeyError, TypeError, AttributeError)) else INTERNAL_ERROR
+            if is_request:
+                self.send({"jsonrpc": "2.0", "id": message["id"], "error": {"code": code, "message": f"{method} failed: {error!r}"}})
+            else:
+                print(f"{method} failed:", file=sys.stderr)
+                traceback.print_exc(file=sys.stderr)
+            return
+        if is_request:
+            self.send({"jsonrpc": "2.0", "id": message["id"], "result": result})
+
+    """
+    Called when the client starts a session, returns the server capabilities
+    """
+    def on_initialize(self, params: dict) -> dict:
+
+        self.initialized = True
+        return {
+            "capabilities": {
+                "textDocumentSync": {"openClose": True, "change": TEXT_DOCUMENT_SYNC_INCREMENTAL},
+                "hoverProvider": True,
+                "declarationProvider": True,
+                "definitionProvider": True,
+            },
+            "serverInfo": {"name": "iol-lsp"},
+        }
+
+    """
+    Called when the client received the server capabilities
+    """
+    def on_initialized(self, params: dict) -> None:
+
+        return None
+
+    """
+    Called when the client wants the server to stop, exit comes after
+    """
+    def on_shutdown(self, params: dict) -> None:
+
+        self.shutdown_requested = True
+        return None
+
+    """
+    Called when a document is opened on the client
+    """
+    def on_did_open(self, params: dict) -> None:
+
+        item = params["textDocument"]
+        document = Document(item["uri"], item.get("version", 0), item["text"])
+        self.documents[document.uri] = document
+        self.stale[document.uri] = document
+
+    """
+    Called when an open document is edited on the client
+    """
+    def on_did_change(self, params: dict) -> None:
+
+        document = self.documents.get(params["textDocument"]["uri"])
+        if document is None:
+            return
+        document.version = params["textDocument"].get("version", document.version)
+        document.apply_changes(params["contentChanges"])
+        self.stale[document.uri] = document
+
+    """
+    Called when a document is closed on the client
+    """
+    def on_did_close(self, params: dict) -> None:
+
+        uri = params["textDocument"]["uri"]
+        self.stale.pop(uri, None)
+        if self.documents.pop(uri, None) is not None:
+            self.send({"jsonrpc": "2.0", "method": "textDocument/publishDiagnostics", "params": {"uri": uri, "diagnostics": []}})
+
+    """
+    Called when the client hovers over a word, shows the type of variables
+    """
+    def on_hover(self, params: dict) -> dict | None:
+
+        found = self.find_variable(params)
+        if found is None:
+            return None
+        analysis, line, word = found
+        var_type = analysis.sym_tbl[word[2][1]][0]
+        return {
+            "contents": {"kind": "markdown", "value": f"```iol\n{var_type} {word[2][1]}\n```"},
+            "range": self.make_range(line, word[0], word[1]),
+        }
+
+    """
+    Called when the client wants to go to the declaration of a variable
+    """
+    def on_declaration(self, params: dict) -> dict | None:
+
+        found = self.find_variable(params)
+        if found is None:
+            return None
+        analysis, line, word = found
+        declaration = analysis.declarations.get(word[2][1])
+        if declaration is None:
+            return None
+        return {"uri": params["textDocument"]["uri"], "range": self.make_range(*declaration)}
+
+    """
+    Finds the declared variable under the position of a hover/declaration request
+
+    Returns
+    -------
+    tuple | None
+        (analysis, line, word) or None if there is no declared variable there
+    """
+    def find_variable(self, params: dict) -> tuple | None:
+
+        document = self.documents.get(params["textDocument"]["uri"])
+        if document is None:
+            return None
+        analysis = self.analyze(document)
+        position = params["position"]
+        line = position["line"]
+        if line >= len(document.line_starts):
+            return None
+        # word columns are UTF-16 code units like the position
+        word = analysis.word_at(line, position["character"])
+        if word is None or word[2][0] != "IDENT" or word[2][1] not in analysis.sym_tbl:
+            return None
+        return analysis, line, word
+
+    """
+    Returns an LSP range within one line
+    """
+    def make_range(self, line: int, start: int, end: int) -> dict:
+
+        return {"start": {"line": line, "character": start}, "end": {"line": line, "character": end}}
+
+    """
+    Returns the analysis of the current text of a document, analyzing it if needed
+    """
+    def analyze(self, document: Document) -> Analysis:
+
+        if document.analysis is not None:
+            return document.analysis
+
+        key = hashlib.blake2b(document.text.encode("utf-8"), digest_size=16).digest()
+        analysis = self.results.pop(key, None)
+        if analysis is None:
+            analysis = self.run_analyzers(document)
+        # keep the most recently used results at the end
+        self.results[key] = analysis
+        while len(self.results) > RESULT_CACHE_SIZE:
+            del self.results[next(iter(self.results))]
+
+        document.analysis = analysis
+        return analysis
+
+    """
+    Runs the lexical and syntax analyzers on the text of a document, and the
+    liveness analysis if there are no errors
+
+    Returns
+    -------
+    Analysis
+        The symbol table, word positions and diagnostics of the text
+    """
+    def run_analyzers(self, document: Document) -> Analysis:
+
+        text = document.text
+        analysis = Analysis()
+        compilation = compile_source(text, self.lex, self.syn, self.codegen)
+        analysis.sym_tbl = compilation.sym_tbl
+        tokens = compilation.tokens
+
+        last_kind = None
+        for i, token in enumerate(tokens):
+            offset = tokens.offset(i)
+            line, start = document.position_at(offset)
+            end = document.position_at(WORD.match(text, offset).end())[1]
+            analysis.words.setdefault(line, list()).append((start, end, token))
+            if token[0] == "IDENT" and (last_kind == "INT" or last_kind == "STR"):
+                analysis.declarations.setdefault(token[1], (line, start, end))
+            last_kind = token[0]
+
+        line_starts = self.lex.tokens.line_starts
+        for word, line_num, message, column in compilation.lexical_errors:
+            offset = line_starts[line_num - 1] + column
+            line, start = document.position_at(offset)
+            end = document.position_at(offset + len(word))[1]
+            analysis.diagnostics.append(self.make_diagnostic(line, start, end, f"{message.capitalize()} {word}"))
+
+        for line_num, message in compilation.syntax_errors:
+            analysis.diagnostics.append(self.make_diagnostic(*self.source_line(document, line_num), str(message)))
+
+        # dead code can only be found in a program without errors
+        if compilation.program is not None:
+            for line_num, message in self.liveness.optimize(compilation.program, analysis.sym_tbl)[2]:
+                analysis.diagnostics.append(self.make_diagnostic(*self.source_line(document, line_num), str(message), SEVERITY_WARNING))
+
+        return analysis
+
+    """
+    Finds where a line numbered by the lexical analyzer is in a document, the
+    analyzer also breaks lines at characters like form feeds that LSP does not
+
+    Returns
+    -------
+    tuple[int, int, int]
+        The LSP line, and the characters where the source line starts and ends in it
+    """
+    def source_line(self, document: Document, line_num: int) -> tuple[int, int, int]:
+
+        line_starts = self.lex.tokens.line_starts
+        # errors at the end of the source may be reported after its last line
+        offset = line_starts[line_num - 1] if line_num <= len(line_starts) else len(document.text)
+        line, start = document.position_at(offset)
+        end = document.line_end(line)
+        if line_num < len(line_starts):
+            end = min(end, line_starts[line_num] - 1)
+        return line, start, document.position_at(end)[1]
+
+    """
+    Returns an LSP diagnostic for a problem within one line, an error unless another severity is given
+    """
+    def make_diagnostic(self, line: int, start: int, end: int, message: str, severity: int = SEVERITY_ERROR) -> dict:
+
+        return {"range": self.make_range(line, start, end), "severity": severity, "source": "iol", "message": message}
+
+    """
+    Sends the diagnostics of the current text of a document
+    """
+    def publish_diagnostics(self, document: Document) -> None:
+
+        analysis = self.analyze(document)
+        self.send({
+            "jsonrpc": "2.0",
+            "method": "textDocument/publishDiagnostics",
+            "params": {"uri": document.uri, "version": document.version, "diagnostics": analysis.diagnostics},
+        })
+
+
+if __name__ == "__main__":
+    server = LanguageServer(sys.stdin.buffer, sys.stdout.buffer)
+    exit_code = server.serve()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    # the reader thread may still be blocked on stdin, which a normal exit waits for
+    os._exit(exit_code)
@@ -0,0 +1,174 @@
+#########################################################################
+# Program description:                                                  #
+#   An opt-in profiler for IOL programs. It records, for every source   #
+#   line, how long its statements took, how many arithmetic operations  #
+#   they did and how big the integers they produced were.               #
+#########################################################################
+
+import time
+
+from iol import Interpreter, ExecutionLimits
+
+
+class LineProfile:
+    """
+    What the statements of one source line did during a profiled run.
+
+    Attributes
+    ----------
+    executions : int
+        Number of statements executed
+    time_ns : int
+        Time spent executing them, without the time spent waiting for input
+    operations : int
+        Number of arithmetic operations
+    max_bits : int
+        Bit length of the biggest integer produced by an operation
+    total_bits : int
+        Sum of the bit lengths of every integer produced by an operation
+    """
+    __slots__ = ("executions", "time_ns", "operations", "max_bits", "total_bits")
+
+    def __init__(self) -> None:
+        self.executions = 0
+        self.time_ns = 0
+        self.operations = 0
+        self.max_bits = 0
+        self.total_bits = 0
+
+
+class ProfilingInterpreter(Interpreter):
+    """
+    An Interpreter that records a LineProfile for every line of the program.
+
+    The plain Interpreter has no profiling code at all, this class adds it by
+    overriding execute() and apply(), so execution pays nothing when profiling
+    is off.
+
+    Attributes
+    ----------
+    lines : dict[int, LineProfile]
+        Profile of each line that executed at least one statement
+
+    Methods
+    ----------
+    report()
+        Returns the profile as a table
+    heat(line)
+        Returns how hot a line is, from 0 to 1
+    heat_levels(levels)
+        Returns how hot every line is, as a level from 0 to levels - 1
+    """
+    def __init__(self, read_input, write, limits: ExecutionLimits | None = None) -> None:
+        super().__init__(self.timed_read_input, write, limits)
+        self.untimed_read_input = read_input
+        self.lines = dict()
+        self.current = None
+        self.input_wait_ns = 0
+
+    """
+    Reads an input without counting the time the user takes to answer
+    """
+    def timed_read_input(self, var: str) -> str | None:
+
+        start = time.perf_counter_ns()
+        user_input = self.untimed_read_input(var)
+        self.input_wait_ns += time.perf_counter_ns() - start
+        return user_input
+
+    def execute(self, statement: tuple) -> None:
+
+        line = statement[3]
+        profile = self.lines.get(line)
+        if profile is None:
+            profile = self.lines[line] = LineProfile()
+        self.current = profile
+        profile.executions += 1
+
+        self.input_wait_ns = 0
+        start = time.perf_counter_ns()
+        try:
+            super().execute(statement)
+        finally:
+            profile.time_ns += time.perf_counter_ns() - start - self.input_wait_ns
+
+    def apply(self, op: str, num1: int, num2: int) -> int:
+
+        result = super().apply(op, num1, num2)
+        profile = self.current
+        bits = result.bit_length()
+        profile.operations += 1
+        profile.total_bits += bits
+        if bits > profile.max_bits:
+            profile.max_bits = bits
+        return result
+
+    """
+    Returns how hot a line is compared to the slowest line
+
+    Parameters
+    ----------
+    line : int
+        A line of the program
+
+    Returns
+    -------
+    float
+        0 for lines that took no time, 1 for the slowest line
+    """
+    def heat(self, line: int) -> float:
+
+        slowest = max((profile.time_ns for profile in self.lines.values()), default=0)
+        profile = self.lines.get(line)
+        if profile is None or slowest == 0:
+            return 0.0
+        return profile.time_ns / slowest
+
+    """
+    Returns how hot every line is compared to the slowest line, finding the
+    slowest line once instead of once per line like heat()
+
+    Parameters
+    ----------
+    levels : int
+        Number of levels
+
+    Returns
+    -------
+    dict[int, int]
+        Level of each line of the program that executed a statement, 0 for
+        lines that took no time, levels - 1 for the slowest line
+    """
+    def heat_levels(self, levels: int) -> dict[int, int]:
+
+        slowest = max((profile.time_ns for profile in self.lines.values()), default=0)
+        if slowest == 0:
+            return {line: 0 for line in self.lines if line is not None}
+        return {
+            line: min(profile.time_ns * levels // slowest, levels - 1)
+            for line, profile in self.lines.items()
+            if line is not None
+        }
+
+    """
+    Returns the profile as a table, one row per line
+
+    Returns
+    -------
+    str
+        The report
+    """
+    def report(self) -> str:
+
+        total_ns = sum(profile.time_ns for profile in self.lines.values())
+        rows = [f"{'line':>6} {'stmts':>7} {'time (ms)':>11} {'time %':>7} {'ops':>9} {'max bits':>9} {'avg bits':>9}"]
+        for line in sorted(self.lines, key=lambda line: -1 if line is None else line):
+            profile = self.lines[line]
+            share = profile.time_ns / total_ns * 100 if total_ns else 0.0
+            average_bits = profile.total_bits / profile.operations if profile.operations else 0.0
+            rows.append(
+                f"{'?' if line is None else line:>6} {profile.executions:>7} {profile.time_ns / 1e6:>11.3f} {share:>7.1f} "
+                f"{profile.operations:>9} {profile.max_bits:>9} {average_bits:>9.1f}"
+            )
+        rows.append(f"total {total_ns / 1e6:.3f} ms")
+        return "\n".join(rows) + "\n"
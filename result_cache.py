@@ -0,0 +1,223 @@
+#########################################################################
+# Program description:                                                  #
+#   A persistent cache of program runs. IOL programs are deterministic  #
+#   and only read input through BEG, so running the same compiled       #
+#   program with the same inputs and limits always gives the same       #
+#   output and variables, which are stored in an SQLite file and        #
+#   returned instead of running the program again.                      #
+#########################################################################
+
+import hashlib
+import json
+import sqlite3
+import time
+import zlib
+
+from iol import INTERPRETER_VERSION, ExecutionLimits, Interpreter, IOLRuntimeError, IOLTimeoutError
+
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# a hit only records that the entry was used if the last record is older than this
+TOUCH_INTERVAL_NS = 60 * 10 ** 9
+# when the cache is too big, entries are evicted until it is this much of its maximum size
+EVICT_TO = 0.9
+# default max_bits of the runs, results are stored as JSON and Python only converts
+# integers of up to 4300 digits to strings by default, see sys.get_int_max_str_digits()
+MAX_JSON_BITS = 14_000
+
+
+"""
+Returns the hash of a compiled program
+
+Line numbers are left out, so programs that only differ in whitespace share
+their results.
+
+Args:
+    program (list[tuple]): statements from CodeGenerator.generate()
+    sym_tbl (dict[str, list[str | int]]): the symbol table of the program
+
+Returns:
+    str: the hash as hexadecimal
+"""
+def program_hash(program: list[tuple], sym_tbl: dict[str, list[str | int]]) -> str:
+
+    statements = [statement[:3] for statement in program]
+    data = json.dumps([statements, list(sym_tbl.items())], separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+class ResultCache:
+    """A class that stores the results of program runs in an SQLite file.
+
+    Results are keyed by the interpreter version, the hash of the compiled
+    program, the inputs and the limits other than time. Runs stopped by the time
+    limit are never stored since they depend on the machine. When the results
+    stored go over max_bytes, the least recently used are evicted. Opening a
+    cache written by another interpreter version empties it.
+
+    Several processes can use the same file at the same time.
+
+    Attributes:
+        path (str): the SQLite file
+        max_bytes (int): maximum size of the stored results
+        hits (int): results returned by get() since the cache was opened
+        misses (int): get() calls that found nothing
+
+    Methods:
+        key(compiled_hash, inputs, limits): returns the key of a run
+        get(key): returns the stored result of a run, None if there is none
+        put(key, result): stores the result of a run
+        run(program, sym_tbl, inputs, limits, compiled_hash): returns the result of a run, stored or new
+        clear(): removes every result
+        close(): closes the file
+    """
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            self.db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS results "
+                "(key BLOB PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, used INTEGER NOT NULL)"
+            )
+            self.db.execute("CREATE INDEX IF NOT EXISTS results_used ON results (used)")
+            version = self.db.execute("SELECT value FROM meta WHERE name = 'version'").fetchone()
+            if version is None or version[0] != INTERPRETER_VERSION:
+                self.db.execute("DELETE FROM results")
+                self.db.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (INTERPRETER_VERSION,))
+                self.db.execute("INSERT OR REPLACE INTO meta VALUES ('size', 0)")
+
+    """Returns the key of a run
+
+    Args:
+        compiled_hash (str): from program_hash()
+        inputs (list[str]): the inputs given to the BEG statements, in order
+        limits (ExecutionLimits): the limits of the run
+
+    Returns:
+        bytes: the key
+    """
+    def key(self, compiled_hash: str, inputs: list[str], limits: ExecutionLimits) -> bytes:
+
+        data = json.dumps(
+            [INTERPRETER_VERSION, compiled_hash, inputs, limits.max_operations, limits.max_bits, limits.max_output],
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(data.encode("utf-8", "surrogatepass")).digest()
+
+    """Returns the stored result of a run
+
+    Args:
+        key (bytes): from key()
+
+    Returns:
+        dict | None: {"output", "error", "variables"}, None if the run is not stored
+    """
+    def get(self, key: bytes) -> dict | None:
+
+        row = self.db.execute("SELECT value, used FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        now = time.time_ns()
+        if now - row[1] > TOUCH_INTERVAL_NS:
+            self.db.execute("UPDATE results SET used = ? WHERE key = ?", (now, key))
+        return json.loads(zlib.decompress(row[0]))
+
+    """Stores the result of a run, evicting the least recently used results if the cache gets too big
+
+    Args:
+        key (bytes): from key()
+        result (dict): {"output", "error", "variables"}
+    """
+    def put(self, key: bytes, result: dict) -> None:
+
+        try:
+            data = json.dumps(result, separators=(",", ":"))
+        except ValueError:
+            # limits over MAX_JSON_BITS allow integers that JSON cannot hold, such results are not kept
+            return
+        value = zlib.compress(data.encode("utf-8", "surrogatepass"), 1)
+        size = len(key) + len(value)
+        if size > self.max_bytes:
+            return
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            old = self.db.execute("SELECT size FROM results WHERE key = ?", (key,)).fetchone()
+            self.db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)", (key, value, size, time.time_ns()))
+            self.db.execute(
+                "UPDATE meta SET value = value + ? WHERE name = 'size'", (size - (old[0] if old else 0),)
+            )
+            total = self.db.execute("SELECT value FROM meta WHERE name = 'size'").fetchone()[0]
+            if total > self.max_bytes:
+                self.evict(total, int(self.max_bytes * EVICT_TO))
+
+    """Removes the least recently used results until at most target bytes are stored,
+    must be called inside a transaction
+    """
+    def evict(self, total: int, target: int) -> None:
+
+        freed = 0
+        victims = list()
+        for key, size in self.db.execute("SELECT key, size FROM results ORDER BY used"):
+            if total - freed <= target:
+                break
+            victims.append((key,))
+            freed += size
+        self.db.executemany("DELETE FROM results WHERE key = ?", victims)
+        self.db.execute("UPDATE meta SET value = value - ? WHERE name = 'size'", (freed,))
+
+    """Returns the result of running a program, from the cache if it was run before with the same inputs
+
+    Args:
+        program (list[tuple]): statements from CodeGenerator.generate()
+        sym_tbl (dict[str, list[str | int]]): the symbol table of the program
+        inputs (list[str]): the inputs of the BEG statements, in order
+        limits (ExecutionLimits | None): the limits of the run, the default ones with max_bits MAX_JSON_BITS if None
+        compiled_hash (str | None): from program_hash(), computed if None
+
+    Returns:
+        tuple[dict, bool]: {"output", "error", "variables"} and whether it came from the cache
+    """
+    def run(self, program: list[tuple], sym_tbl: dict[str, list[str | int]], inputs: list[str], limits: ExecutionLimits | None = None, compiled_hash: str | None = None) -> tuple[dict, bool]:
+
+        if limits is None:
+            limits = ExecutionLimits(max_bits=MAX_JSON_BITS)
+        remaining = iter(inputs)
+        output = list()
+        interpreter = Interpreter(lambda var: next(remaining, None), output.append, limits)
+        key = self.key(compiled_hash or program_hash(program, sym_tbl), inputs, interpreter.limits)
+        result = self.get(key)
+        if result is not None:
+            return result, True
+
+        try:
+            interpreter.run(program, sym_tbl)
+            error = None
+        except IOLTimeoutError as timeout:
+            # depends on the machine, not stored
+            return {"output": "".join(output), "error": str(timeout), "variables": interpreter.variables}, False
+        except IOLRuntimeError as runtime_error:
+            error = str(runtime_error)
+        result = {"output": "".join(output), "error": error, "variables": interpreter.variables}
+        self.put(key, result)
+        return result, False
+
+    """Removes every stored result
+    """
+    def clear(self) -> None:
+
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            self.db.execute("DELETE FROM results")
+            self.db.execute("UPDATE meta SET value = 0 WHERE name = 'size'")
+
+    def close(self) -> None:
+        self.db.close()
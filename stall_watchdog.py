@@ -0,0 +1,318 @@
+#########################################################################
+# Program description:                                                  #
+#   An opt-in watchdog for the Tk event loop of the IDE. A callback     #
+#   scheduled with after() ticks while the loop is responsive; when it  #
+#   stops ticking for longer than a threshold, a background thread      #
+#   samples the stack of the main thread, so the report shows which     #
+#   callback blocked the loop and where it was spending its time.       #
+#########################################################################
+
+import os
+import platform
+import sys
+import threading
+import time
+import tkinter as tk
+import traceback
+from collections import Counter
+
+
+# frames from these files are left out of the stack samples
+HIDDEN_FILES = (os.path.abspath(__file__), os.path.abspath(tk.__file__))
+# innermost frames kept of every stack sample
+SAMPLE_DEPTH = 8
+# stack samples shown for every stall in the report
+SHOWN_SAMPLES = 3
+
+
+class Stall:
+    """
+    A period during which the event loop did not run.
+
+    Attributes
+    ----------
+    start : float
+        When the loop stopped, as time.time()
+    duration : float
+        Seconds the loop was blocked
+    callbacks : tuple[str]
+        The traced callbacks that were running, outermost first
+    samples : Counter[tuple[str]]
+        How many times each stack was sampled, innermost frame last
+    """
+    __slots__ = ("start", "duration", "callbacks", "samples")
+
+    def __init__(self, start: float, callbacks: tuple[str]) -> None:
+        self.start = start
+        self.duration = 0.0
+        self.callbacks = callbacks
+        self.samples = Counter()
+
+
+class CallbackStats:
+    """
+    How long the calls to one callback held the event loop.
+
+    Attributes
+    ----------
+    calls : int
+        Number of calls
+    total : float
+        Seconds spent in them, including the dialogs they opened
+    longest : float
+        Seconds of the longest call
+    stalls : int
+        Number of stalls that happened while it was running
+    """
+    __slots__ = ("calls", "total", "longest", "stalls")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total = 0.0
+        self.longest = 0.0
+        self.stalls = 0
+
+
+class StallWatchdog:
+    """
+    A class that records the callbacks that block the Tk event loop.
+
+    While it runs, every Tk callback (commands, bindings and after() callbacks)
+    goes through it and is timed. A tick scheduled with after() every interval
+    seconds tells that the loop is running, also inside the loops of dialogs.
+    When no tick happened for threshold seconds, a thread samples the stack of
+    the main thread every interval seconds until the loop runs again, and the
+    stall is recorded with the callbacks that were running and the samples.
+    Nothing is traced when the watchdog is not running.
+
+    Attributes
+    ----------
+    root : tk.Misc
+        A widget of the application
+    threshold : float
+        Seconds without a tick that make a stall
+    interval : float
+        Seconds between ticks and between stack samples
+    max_stalls : int
+        Number of stalls kept, the shortest are dropped
+    stalls : list[Stall]
+        The stalls recorded, in the order they happened
+    callbacks : dict[str, CallbackStats]
+        Stats of each callback by name
+    dropped : int
+        Number of stalls dropped because there were too many
+
+    Methods
+    ----------
+    start()
+        Starts tracing the event loop
+    stop()
+        Stops tracing, the results are kept
+    running()
+        Returns whether the watchdog is tracing
+    report()
+        Returns a summary of the stalls and callbacks
+    """
+    def __init__(self, root: tk.Misc, threshold: float = 0.1, interval: float = 0.02, max_stalls: int = 100) -> None:
+        self.root = root
+        self.threshold = threshold
+        self.interval = interval
+        self.max_stalls = max_stalls
+        self.stalls = list()
+        self.callbacks = dict()
+        self.dropped = 0
+        self.traced_time = 0.0
+        self.started = None
+        # callbacks running on the main thread, read by the sampler
+        self.active = list()
+        self.current = None
+        self.last_tick = 0.0
+        self.pending = None
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.sampler = None
+        self.main_thread_id = threading.main_thread().ident
+        self.original_call = None
+
+    """
+    Starts tracing the event loop, must be called from the main thread
+    """
+    def start(self) -> None:
+
+        if self.running():
+            return
+        watchdog = self
+        original_call = self.original_call = tk.CallWrapper.__call__
+
+        def traced_call(wrapper, *args):
+            return watchdog.trace(wrapper, original_call, args)
+
+        tk.CallWrapper.__call__ = traced_call
+        self.started = time.perf_counter()
+        self.last_tick = self.started
+        self.pending = self.root.after(int(self.interval * 1000), self.tick)
+        self.stopping.clear()
+        self.sampler = threading.Thread(target=self.sample_loop, name="stall-watchdog", daemon=True)
+        self.sampler.start()
+
+    """
+    Stops tracing the event loop, the stalls and stats recorded are kept
+    """
+    def stop(self) -> None:
+
+        if not self.running():
+            return
+        tk.CallWrapper.__call__ = self.original_call
+        self.original_call = None
+        if self.pending is not None:
+            self.root.after_cancel(self.pending)
+            self.pending = None
+        self.stopping.set()
+        self.sampler.join()
+        self.sampler = None
+        with self.lock:
+            self.current = None
+        self.traced_time += time.perf_counter() - self.started
+        self.started = None
+
+    def running(self) -> bool:
+        return self.sampler is not None
+
+    """
+    Calls a Tk callback and times it
+
+    Parameters
+    ----------
+    wrapper : tk.CallWrapper
+        The callback as registered in Tk
+    original_call : Callable
+        What tk.CallWrapper.__call__ was before the watchdog started
+    args : tuple
+        The arguments from Tk
+    """
+    def trace(self, wrapper: tk.CallWrapper, original_call, args: tuple):
+
+        func = wrapper.func
+        code = getattr(func, "__code__", None)
+        if code is not None and code.co_name == "callit" and "func" in code.co_freevars:
+            # after() registers a closure that calls the function it was given
+            func = func.__closure__[code.co_freevars.index("func")].cell_contents
+        if func == self.tick:
+            return original_call(wrapper, *args)
+        name = getattr(func, "__qualname__", None) or repr(func)
+        self.active.append(name)
+        start = time.perf_counter()
+        try:
+            return original_call(wrapper, *args)
+        finally:
+            duration = time.perf_counter() - start
+            self.active.pop()
+            stats = self.callbacks.get(name)
+            if stats is None:
+                stats = self.callbacks[name] = CallbackStats()
+            stats.calls += 1
+            stats.total += duration
+            if duration > stats.longest:
+                stats.longest = duration
+
+    """
+    Runs every interval seconds while the event loop is responsive, records
+    the stall that ends when it runs late
+    """
+    def tick(self) -> None:
+
+        now = time.perf_counter()
+        with self.lock:
+            stall = self.current
+            self.current = None
+            late = now - self.last_tick
+            self.last_tick = now
+        if late > self.threshold:
+            if stall is None:
+                # too short for the sampler to see it
+                stall = Stall(time.time() - late, tuple(self.active))
+            stall.duration = late
+            self.record(stall)
+        self.pending = self.root.after(int(self.interval * 1000), self.tick)
+
+    """
+    Keeps a stall, dropping the shortest one if there are too many
+
+    Parameters
+    ----------
+    stall : Stall
+        A stall that ended
+    """
+    def record(self, stall: Stall) -> None:
+
+        for name in set(stall.callbacks):
+            stats = self.callbacks.get(name)
+            if stats is None:
+                stats = self.callbacks[name] = CallbackStats()
+            stats.stalls += 1
+        self.stalls.append(stall)
+        if len(self.stalls) > self.max_stalls:
+            self.stalls.remove(min(self.stalls, key=lambda stall: stall.duration))
+            self.dropped += 1
+
+    """
+    Runs on the sampler thread, samples the stack of the main thread while
+    the event loop is blocked
+    """
+    def sample_loop(self) -> None:
+
+        while not self.stopping.wait(self.interval):
+            with self.lock:
+                blocked = time.perf_counter() - self.last_tick
+                if blocked <= self.threshold:
+                    continue
+                if self.current is None:
+                    self.current = Stall(time.time() - blocked, tuple(self.active))
+                stall = self.current
+            frame = sys._current_frames().get(self.main_thread_id)
+            if frame is None:
+                continue
+            stack = tuple(
+                f"{os.path.basename(entry.filename)}:{entry.lineno} {entry.name}"
+                for entry in traceback.extract_stack(frame)
+                if os.path.abspath(entry.filename) not in HIDDEN_FILES
+            )
+            del frame
+            stall.samples[stack[-SAMPLE_DEPTH:]] += 1
+
+    """
+    Returns a summary of the stalls and callbacks, to attach to bug reports
+
+    Returns
+    -------
+    str
+        The report
+    """
+    def report(self) -> str:
+
+        traced_time = self.traced_time
+        if self.started is not None:
+            traced_time += time.perf_counter() - self.started
+        rows = [
+            f"UI stalls over {self.threshold * 1000:.0f} ms, traced for {traced_time:.1f} s",
+            f"Python {platform.python_version()}, Tk {tk.TkVersion}, {platform.platform()}",
+            "",
+            f"{'callback':<40} {'calls':>7} {'total (ms)':>11} {'max (ms)':>10} {'stalls':>7}",
+        ]
+        for name, stats in sorted(self.callbacks.items(), key=lambda item: -item[1].longest):
+            rows.append(
+                f"{name:<40} {stats.calls:>7} {stats.total * 1000:>11.1f} {stats.longest * 1000:>10.1f} {stats.stalls:>7}"
+            )
+
+        rows.append("")
+        rows.append(f"{len(self.stalls) + self.dropped} stall(s)" + (f", {self.dropped} shortest not kept" if self.dropped else ""))
+        for number, stall in enumerate(self.stalls, 1):
+            when = time.strftime("%H:%M:%S", time.localtime(stall.start))
+            callbacks = " > ".join(stall.callbacks) or "no traced callback"
+            rows.append("")
+            rows.append(f"#{number} at {when}: {stall.duration * 1000:.0f} ms in {callbacks}")
+            total = sum(stall.samples.values())
+            for stack, count in stall.samples.most_common(SHOWN_SAMPLES):
+                rows.append(f"  {count}/{total} samples:")
+                rows.extend(f"    {frame}" for frame in stack)
+        return "\n".join(rows) + "\n"